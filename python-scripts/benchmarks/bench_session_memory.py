@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Memory benchmark for long sessions with and without blob offloading.
+
+Builds the message history of a session with many turns, each carrying a large
+tool output (a launchpad_chat answer plus its artifact), and reports how big
+the state gets, how long a checkpoint-style copy and serialization of it takes,
+how long building the next prompt takes, and what the blob store holds.
+
+Usage:
+    python python-scripts/benchmarks/bench_session_memory.py --turns 500 --output-kb 40
+"""
+import argparse
+import copy
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from launchpad_blobs import BlobStore, offload_tool_message, resolve_messages
+
+def tool_output(turn: int, size: int) -> str:
+    """A distinct multi-paragraph answer of roughly size characters."""
+    paragraph = f"Turn {turn}: go-to-market notes, pricing tiers and launch checklist items. "
+    return (paragraph * (size // len(paragraph) + 1))[:size]
+
+def build_session(turns: int, output_size: int, store: BlobStore = None) -> list:
+    """Message history of a session; tool outputs are offloaded when a store is given."""
+    messages = []
+    for turn in range(turns):
+        call_id = f"call_{turn}"
+        text = tool_output(turn, output_size)
+        result = ToolMessage(
+            content=text,
+            artifact={"text": text, "parts": [{"type": "text", "text": text}]},
+            tool_call_id=call_id,
+            name="launchpad_chat"
+        )
+        if store is not None:
+            result = offload_tool_message(result, store)
+        messages += [
+            HumanMessage(content=f"Question {turn}"),
+            AIMessage(content="", tool_calls=[{"name": "launchpad_chat", "args": {"message": f"Question {turn}"}, "id": call_id}]),
+            result,
+            AIMessage(content=f"Answer {turn}: a short summary of the agent's response."),
+        ]
+    return messages
+
+def measure(label: str, turns: int, output_size: int, store: BlobStore = None) -> dict:
+    tracemalloc.start()
+    messages = build_session(turns, output_size, store)
+    traced_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Blobs the store keeps in memory are not part of the state
+    store_bytes = store.memory_usage() if store is not None else 0
+
+    # What a checkpointer does on every step: copy and serialize the state
+    started = time.perf_counter()
+    copy.deepcopy({"messages": messages})
+    copy_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    serialized = pickle.dumps({"messages": messages})
+    serialize_ms = (time.perf_counter() - started) * 1000
+
+    # Building the last prompt expands the references again
+    started = time.perf_counter()
+    resolve_messages(messages, store) if store is not None else list(messages)
+    resolve_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "label": label,
+        "state_mb": (traced_bytes - store_bytes) / 1e6,
+        "store_mb": store_bytes / 1e6,
+        "peak_mb": peak_bytes / 1e6,
+        "serialized_mb": len(serialized) / 1e6,
+        "copy_ms": copy_ms,
+        "serialize_ms": serialize_ms,
+        "resolve_ms": resolve_ms,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=500, help="Turns in the simulated session")
+    parser.add_argument("--output-kb", type=int, default=40, help="Size of each tool output in KB")
+    parser.add_argument("--memory-mb", type=float, default=8, help="Blob store memory budget in MB")
+    args = parser.parse_args()
+    output_size = args.output_kb * 1024
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = BlobStore(directory, memory_bytes=int(args.memory_mb * 1e6))
+        rows = [
+            measure("inline", args.turns, output_size),
+            measure("offloaded", args.turns, output_size, store),
+        ]
+        spilled_files = sum(len(files) for _, _, files in os.walk(directory))
+
+    print(f"{args.turns} turns, {args.output_kb} KB per tool output, {args.memory_mb:g} MB blob memory budget\n")
+    print(f"{'state':<10} {'state MB':>9} {'store MB':>9} {'peak MB':>8} {'pickle MB':>10} {'copy ms':>8} {'pickle ms':>10} {'resolve ms':>11}")
+    for row in rows:
+        print(
+            f"{row['label']:<10} {row['state_mb']:>9.1f} {row['store_mb']:>9.1f} {row['peak_mb']:>8.1f} "
+            f"{row['serialized_mb']:>10.2f} {row['copy_ms']:>8.1f} {row['serialize_ms']:>10.1f} {row['resolve_ms']:>11.1f}"
+        )
+    print("\npeak MB includes the blobs the store keeps in memory, up to the --memory-mb budget")
+    print(f"Blob store: {spilled_files} blobs spilled to disk, stats {store.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Shared setup for the replay benchmarks.
+
+The scripts read their configuration when imported, so the agent ids the
+cassettes were recorded with are put into the environment first. Every
+request is then answered from a cassette; nothing goes over the network.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CASSETTE_DIR = os.path.join(BENCHMARK_DIR, "cassettes")
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+
+for _name in os.listdir(CASSETTE_DIR):
+    with open(os.path.join(CASSETTE_DIR, _name)) as _f:
+        os.environ.update(json.load(_f).get("metadata", {}).get("env", {}))
+os.environ.setdefault("OPENAI_API_KEY", "unused-in-replay")
+os.environ.setdefault("MCP_BASE_URL", "http://replay.invalid")
+os.environ.setdefault("A2A_BASE_URL", "http://replay.invalid")
+
+from launchpad_cassette import Cassette
+
+@pytest.fixture
+def replay():
+    """Replay a cassette by name; latency_scale=0 serves responses instantly."""
+    def use(name: str, latency_scale: float = 0.0) -> Cassette:
+        return Cassette(os.path.join(CASSETTE_DIR, f"{name}.json"), "replay", latency_scale)
+    return use
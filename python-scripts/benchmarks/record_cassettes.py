@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Record the cassettes replayed by the benchmark suite.
+
+By default the traffic comes from the local stand-in server
+(launchpad_standin.py). With --live the scripts talk to the server configured
+in .env.local, which gives cassettes with real payload sizes and latencies;
+secrets are redacted before they are written.
+
+Usage:
+    python python-scripts/benchmarks/record_cassettes.py [--live]
+"""
+import argparse
+import os
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CASSETTE_DIR = os.path.join(BENCHMARK_DIR, "cassettes")
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+
+# Prompts the suite replays; requests are matched on their body
+SEARCH_QUERIES = ["pricing strategy", "go-to-market plan", "customer onboarding"]
+CHAT_MESSAGES = ["How should I price my SaaS product?", "What goes into a launch checklist?"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="Record from the configured LaunchpadAI server")
+    args = parser.parse_args()
+
+    if not args.live:
+        from launchpad_standin import StandinConfig, start_standin_server
+
+        _, base_url = start_standin_server(StandinConfig(latency_ms=15, seed=1))
+        os.environ.update(MCP_BASE_URL=base_url, A2A_BASE_URL=base_url)
+        for name in ("MCP_ENDPOINT_ID", "MCP_API_KEY", "MCP_AGENT_ID", "AGENT_MCP_API_KEY", "A2A_AGENT_ID", "A2A_CLIENT_ID", "A2A_CLIENT_SECRET"):
+            os.environ[name] = "standin"
+    # Recording calls the tools directly; the LLM is never used
+    os.environ.setdefault("OPENAI_API_KEY", "unused-while-recording")
+
+    import langgraph_a2a_agent as a2a_agent
+    import langgraph_mcp_agent as mcp_agent
+    import langgraph_mcp_collections as collections
+    from launchpad_cassette import Cassette
+
+    def record(name, env_names, calls):
+        path = os.path.join(CASSETTE_DIR, f"{name}.json")
+        metadata = {"env": {env_name: os.environ.get(env_name, "") for env_name in env_names}}
+        with Cassette(path, "record", metadata=metadata) as cassette:
+            for tool, tool_args in calls:
+                tool.invoke(tool_args)
+        print(f"{path}: {len(cassette.interactions)} interactions")
+
+    record("collections", ["MCP_ENDPOINT_ID"], [
+        *[(collections.search_collection, {"query": query}) for query in SEARCH_QUERIES],
+        (collections.get_chunk, {"chunk_id": "chunk-0"}),
+    ])
+    record("mcp_agent", ["MCP_AGENT_ID"], [
+        *[(mcp_agent.launchpad_chat, {"message": message}) for message in CHAT_MESSAGES],
+        (mcp_agent.get_agent_info, {}),
+    ])
+    mcp_agent.mcp_session.close()
+    record("a2a_agent", ["A2A_AGENT_ID"], [
+        *[(a2a_agent.chat_with_a2a_agent, {"message": message}) for message in CHAT_MESSAGES],
+        (a2a_agent.check_a2a_agent_health, {}),
+        (a2a_agent.get_a2a_agent_capabilities, {}),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Unit tests for the load generator's arrival schedule and latency histogram.
+
+Run with:
+    pytest python-scripts/benchmarks/test_load_schedule.py
+"""
+import random
+
+import pytest
+
+from launchpad_load import LatencyHistogram, arrival_times, parse_stages
+
+def schedule(spec: str, poisson: bool = False, seed: int = 1):
+    return list(arrival_times(parse_stages(spec), poisson, random.Random(seed)))
+
+@pytest.mark.parametrize("spec, expected", [
+    ("10:2", 20),
+    ("10:2,5:1", 25),
+    ("0-10:10", 50),
+    ("10-0:10", 50),
+    ("0:5", 0),
+    ("0:5,4:1", 4),
+    ("0.5:3", 2),
+])
+def test_arrival_counts(spec, expected):
+    assert len(schedule(spec)) == expected
+
+def test_constant_arrivals_are_evenly_spaced_from_stage_start():
+    times = schedule("4:1,2:1")
+    assert times == pytest.approx([0, 0.25, 0.5, 0.75, 1.0, 1.5])
+
+def test_ramp_arrivals_stay_in_their_stage_and_speed_up():
+    times = schedule("0-10:10,10:1")
+    ramp = times[:50]
+    assert all(0 <= t < 10 for t in ramp)
+    gaps = [b - a for a, b in zip(ramp, ramp[1:])]
+    assert gaps == sorted(gaps, reverse=True)
+    assert times[50:] == pytest.approx([10 + n / 10 for n in range(10)])
+
+def test_poisson_arrivals_match_the_mean_rate():
+    times = schedule("100:50", poisson=True, seed=7)
+    assert len(times) == pytest.approx(5000, rel=0.05)
+    assert times == sorted(times) and times[-1] < 50
+
+@pytest.mark.parametrize("spec", ["-5:10", "5--3:10", "10:0", "10:-1"])
+def test_invalid_stages_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_stages(spec)
+
+def test_small_latencies_are_exact():
+    histogram = LatencyHistogram()
+    for us in range(1, 101):
+        histogram.record(us / 1_000_000 + 1e-9)
+    assert histogram.percentile(50) == pytest.approx(0.050)
+    assert histogram.percentile(99) == pytest.approx(0.099)
+    assert histogram.percentile(100) == pytest.approx(0.100)
+
+@pytest.mark.parametrize("percent", [50, 90, 99, 99.9])
+def test_percentiles_within_relative_error(percent):
+    histogram = LatencyHistogram()
+    values_ms = list(range(1, 10_001))
+    random.Random(3).shuffle(values_ms)
+    for ms in values_ms:
+        histogram.record(ms / 1000)
+    expected = sorted(values_ms)[int(percent / 100 * len(values_ms) + 0.5) - 1]
+    assert histogram.percentile(percent) == pytest.approx(expected, rel=1 / histogram.half)
+    assert histogram.percentile(percent) >= expected
+
+def test_merge_matches_recording_into_one_histogram():
+    combined, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for ms in range(1, 2001):
+        combined.record(ms / 1000)
+        (first if ms % 2 else second).record(ms / 1000)
+    first.merge(second)
+    assert first.summary() == combined.summary()
+    assert first.percentile(100) == pytest.approx(2000)
@@ -0,0 +1,95 @@
+"""Benchmarks of tool response handling and full graph turns against recorded traffic.
+
+Run with:
+    pytest python-scripts/benchmarks --benchmark-only
+    pytest python-scripts/benchmarks --benchmark-autosave          # store a baseline
+    pytest python-scripts/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Responses come from the cassettes in benchmarks/cassettes (re-record them
+with record_cassettes.py), so timings measure the scripts' own parsing and
+formatting, not the backend.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, StateGraph
+
+import langgraph_a2a_agent as a2a_agent
+import langgraph_mcp_agent as mcp_agent
+import langgraph_mcp_collections as collections
+from launchpad_graph import make_agent_node, make_finalize_node, make_tool_node, should_continue
+
+class ScriptedLLM:
+    """Stands in for ChatOpenAI: asks for one tool call, then answers from its result.
+
+    LLM traffic goes through the OpenAI SDK rather than requests, so it is not
+    on the cassettes; scripting it keeps graph timings deterministic.
+    """
+
+    def __init__(self, tool_name: str, tool_args: dict):
+        self.tool_name = tool_name
+        self.tool_args = tool_args
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content=f"Summary of {len(messages[-1].content)} characters of tool output.")
+        return AIMessage(content="", tool_calls=[{"name": self.tool_name, "args": self.tool_args, "id": "call_1"}])
+
+def build_graph(module, tool_name: str, tool_args: dict):
+    """The script's graph wiring with a scripted LLM."""
+    llm = ScriptedLLM(tool_name, tool_args)
+    workflow = StateGraph(module.AgentState)
+    workflow.add_node("agent", make_agent_node(llm, module.SYSTEM_PROMPT))
+    workflow.add_node("tools", make_tool_node(module.tools))
+    workflow.add_node("finalize", make_finalize_node(llm, module.SYSTEM_PROMPT))
+    workflow.set_entry_point("agent")
+    workflow.add_conditional_edges("agent", should_continue, {"tools": "tools", "finalize": "finalize", END: END})
+    workflow.add_edge("tools", "agent")
+    workflow.add_edge("finalize", END)
+    return workflow.compile()
+
+def test_search_collection_formatting(benchmark, replay):
+    with replay("collections"):
+        result = benchmark(collections.search_collection.invoke, {"query": "pricing strategy"})
+    assert result.startswith("Found")
+
+def test_get_chunk(benchmark, replay):
+    with replay("collections"):
+        result = benchmark(collections.get_chunk.invoke, {"chunk_id": "chunk-0"})
+    assert "Error" not in result
+
+def test_launchpad_chat_part_joining(benchmark, replay):
+    with replay("mcp_agent"):
+        result = benchmark(mcp_agent.launchpad_chat.invoke, {"message": "How should I price my SaaS product?"})
+    assert not result.startswith(("Error", "MCP Error"))
+
+def test_get_agent_info(benchmark, replay):
+    with replay("mcp_agent"):
+        result = benchmark(mcp_agent.get_agent_info.invoke, {})
+    assert not result.startswith(("Error", "MCP Error"))
+
+def test_a2a_chat(benchmark, replay):
+    with replay("a2a_agent"):
+        result = benchmark(a2a_agent.chat_with_a2a_agent.invoke, {"message": "How should I price my SaaS product?"})
+    assert not result.startswith("❌")
+
+def test_a2a_capabilities(benchmark, replay):
+    with replay("a2a_agent"):
+        result = benchmark(a2a_agent.get_a2a_agent_capabilities.invoke, {})
+    assert not result.startswith("❌")
+
+@pytest.mark.parametrize("module, tool_name, tool_args, cassette", [
+    (collections, "search_collection", {"query": "pricing strategy"}, "collections"),
+    (mcp_agent, "launchpad_chat", {"message": "How should I price my SaaS product?"}, "mcp_agent"),
+    (a2a_agent, "chat_with_a2a_agent", {"message": "How should I price my SaaS product?"}, "a2a_agent"),
+], ids=["collections", "mcp_agent", "a2a_agent"])
+def test_graph_turn(benchmark, replay, module, tool_name, tool_args, cassette):
+    app = build_graph(module, tool_name, tool_args)
+    state = {"messages": [HumanMessage(content="benchmark")]}
+    with replay(cassette):
+        final_state = benchmark(lambda: asyncio.run(app.ainvoke(state)))
+    assert final_state["messages"][-1].content.startswith("Summary")
@@ -1,19 +1,48 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
 import json
 import os
+import random
 import requests
 import sys
 import time
-from typing import Dict, Any, List, TypedDict, Annotated
+from typing import Dict, Any, List, Optional, Tuple, TypedDict, Annotated
 from dotenv import load_dotenv
 
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.tools import tool
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
+
+from launchpad_cache import SharedCache
+from launchpad_accounting import accounting
+from launchpad_cassette import cassette_from_env
+from launchpad_deadline import (
+    DeadlineExceeded,
+    TurnCancelled,
+    TurnDeadline,
+    current_deadline,
+    get_deadline,
+    request_timeout,
+    run_turn,
+)
+from launchpad_graph import (
+    ROUTER_MODEL,
+    ROUTER_TEMPERATURE,
+    SPLIT_MODEL_TIERS,
+    SYNTHESIS_MODEL,
+    SYNTHESIS_TEMPERATURE,
+    format_loop_metrics,
+    make_agent_node,
+    make_finalize_node,
+    make_tool_node,
+    should_continue,
+    tool_error,
+)
+from launchpad_profile import profiler
+from launchpad_repl import AsyncLineReader, BackgroundTasks
 
 # Load environment variables from .env.local
 load_dotenv("./.env.local")
@@ -24,6 +53,17 @@ A2A_CLIENT_ID = os.getenv("A2A_CLIENT_ID")
 A2A_CLIENT_SECRET = os.getenv("A2A_CLIENT_SECRET")
 A2A_BASE_URL = os.getenv("A2A_BASE_URL", "http://localhost:3000")
 
+# Background health probing. A2A_AGENT_ID is always probed; A2A_HEALTH_AGENT_IDS
+# is an optional comma-separated list of additional agents to watch. Jitter is a
+# fraction of the interval.
+A2A_HEALTH_AGENT_IDS = list(dict.fromkeys(
+    agent_id.strip()
+    for agent_id in [A2A_AGENT_ID or ""] + os.getenv("A2A_HEALTH_AGENT_IDS", "").split(",")
+    if agent_id.strip()
+))
+A2A_HEALTH_INTERVAL = float(os.getenv("A2A_HEALTH_INTERVAL", "30"))
+A2A_HEALTH_JITTER = float(os.getenv("A2A_HEALTH_JITTER", "0.2"))
+
 # Define the state for our graph
 class AgentState(TypedDict):
     messages: Annotated[List[Any], add_messages]
@@ -31,12 +71,16 @@ class AgentState(TypedDict):
 class A2AClient:
     """Client for interacting with A2A agents using OAuth2 authentication."""
     
-    def __init__(self, agent_id: str, client_id: str, client_secret: str, base_url: str):
+    def __init__(self, agent_id: str, client_id: str, client_secret: str, base_url: str,
+                 token_cache: Optional[SharedCache] = None):
         self.agent_id = agent_id
         self.client_id = client_id
         self.client_secret = client_secret
         self.base_url = base_url
         self.access_token = None
+        self.token_expires_at = 0.0
+        # Lets processes running the same client share one access token
+        self.token_cache = token_cache
         self.endpoints = {
             "chat": f"{base_url}/api/a2a/agents/{agent_id}/chat",
             "capabilities": f"{base_url}/api/a2a/agents/{agent_id}/capabilities",
@@ -47,8 +91,13 @@ class A2AClient:
             "token": f"{base_url}/api/a2a/auth/token"
         }
     
-    def authenticate(self) -> bool:
-        """Authenticate with the A2A service using OAuth2 authorization code flow."""
+    def authenticate(self, quiet: bool = False) -> bool:
+        """Authenticate with the A2A service using OAuth2 authorization code flow.
+        
+        quiet suppresses the progress output, for refreshes that run while the
+        user is typing.
+        """
+        log = (lambda *args, **kwargs: None) if quiet else print
         try:
             # Step 1: Get authorization code
             # For a command-line client, we'll simulate the authorization flow
@@ -85,43 +134,73 @@ class A2AClient:
             mock_auth_code = base64.b64encode(json.dumps(code_data).encode()).decode()
             
             # Step 2: Exchange authorization code for access token
-            print(f"🔄 Exchanging authorization code for access token...")
-            print(f"📡 Token URL: {self.auth_endpoints['token']}")
+            log(f"🔄 Exchanging authorization code for access token...")
+            log(f"📡 Token URL: {self.auth_endpoints['token']}")
             
-            token_response = requests.post(
-                self.auth_endpoints["token"],
-                json={
-                    "grant_type": "authorization_code",
-                    "code": mock_auth_code,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "redirect_uri": redirect_uri
-                },
-                headers={"Content-Type": "application/json"}
-            )
+            with get_deadline().stage("a2a token"):
+                token_response = requests.post(
+                    self.auth_endpoints["token"],
+                    json={
+                        "grant_type": "authorization_code",
+                        "code": mock_auth_code,
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                        "redirect_uri": redirect_uri
+                    },
+                    headers={"Content-Type": "application/json"},
+                    timeout=request_timeout("a2a token")
+                )
             
-            print(f"📊 Token response status: {token_response.status_code}")
+            log(f"📊 Token response status: {token_response.status_code}")
             
             if token_response.status_code == 200:
                 token_data = token_response.json()
                 self.access_token = token_data.get("access_token")
-                print(f"✅ Successfully authenticated with A2A service")
-                print(f"🔑 Access token obtained (expires in {token_data.get('expires_in', 'unknown')} seconds)")
-                print(f"🎯 Token type: {token_data.get('token_type', 'unknown')}")
+                # Refresh a minute early so a token never expires mid-request
+                expires_in = token_data.get("expires_in")
+                lifetime = expires_in if isinstance(expires_in, (int, float)) else 3600
+                self.token_expires_at = time.time() + lifetime - 60
+                if self.token_cache is not None:
+                    self.token_cache.set(
+                        self._token_cache_key(),
+                        {"access_token": self.access_token, "expires_at": self.token_expires_at},
+                        lifetime - 60
+                    )
+                log(f"✅ Successfully authenticated with A2A service")
+                log(f"🔑 Access token obtained (expires in {token_data.get('expires_in', 'unknown')} seconds)")
+                log(f"🎯 Token type: {token_data.get('token_type', 'unknown')}")
                 return True
             else:
-                print(f"❌ Token exchange failed: {token_response.status_code}")
+                log(f"❌ Token exchange failed: {token_response.status_code}")
                 try:
                     error_data = token_response.json()
-                    print(f"📋 Error details: {json.dumps(error_data, indent=2)}")
+                    log(f"📋 Error details: {json.dumps(error_data, indent=2)}")
                 except:
-                    print(f"📋 Error text: {token_response.text}")
+                    log(f"📋 Error text: {token_response.text}")
                 return False
                 
+        except (DeadlineExceeded, TurnCancelled):
+            # Deadline and Ctrl+C end the turn; they aren't request failures
+            raise
         except Exception as e:
-            print(f"❌ Authentication error: {e}")
+            log(f"❌ Authentication error: {e}")
             return False
     
+    def _token_cache_key(self) -> str:
+        return f"a2a-token:{self.base_url}:{self.agent_id}:{self.client_id}"
+    
+    def ensure_authenticated(self, quiet: bool = False) -> bool:
+        """Authenticate only if there is no access token or it is about to expire."""
+        if self.access_token and time.time() < self.token_expires_at:
+            return True
+        # Another process may already hold a valid token
+        cached = self.token_cache.get(self._token_cache_key()) if self.token_cache is not None else None
+        if cached and time.time() < cached["expires_at"]:
+            self.access_token = cached["access_token"]
+            self.token_expires_at = cached["expires_at"]
+            return True
+        return self.authenticate(quiet)
+    
     def get_headers(self) -> Dict[str, str]:
         """Get headers with authentication token."""
         if not self.access_token:
@@ -133,34 +212,55 @@ class A2AClient:
         }
     
     def check_health(self) -> Dict[str, Any]:
-        """Check agent health status."""
+        """Check agent health status.
+        
+        The health endpoint is public, so the token is sent only if we already
+        have one; background probes never trigger an authentication round trip.
+        """
         try:
-            response = requests.get(
-                self.endpoints["health"],
-                headers=self.get_headers()
-            )
+            headers = self.get_headers() if self.access_token else {"Content-Type": "application/json"}
+            with get_deadline().stage("a2a health"):
+                response = requests.get(
+                    self.endpoints["health"],
+                    headers=headers,
+                    timeout=request_timeout("a2a health")
+                )
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
             else:
-                return {"success": False, "error": f"Health check failed: {response.status_code}"}
+                try:
+                    error_data = response.json()
+                except ValueError:
+                    error_data = {}
+                return {
+                    "success": False,
+                    "status": error_data.get("status", "unhealthy"),
+                    "error": f"Health check failed: {response.status_code}"
+                }
                 
+        except (DeadlineExceeded, TurnCancelled):
+            raise
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Get agent capabilities."""
         try:
-            response = requests.get(
-                self.endpoints["capabilities"],
-                headers=self.get_headers()
-            )
+            with get_deadline().stage("a2a capabilities"):
+                response = requests.get(
+                    self.endpoints["capabilities"],
+                    headers=self.get_headers(),
+                    timeout=request_timeout("a2a capabilities")
+                )
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
             else:
                 return {"success": False, "error": f"Capabilities request failed: {response.status_code}"}
                 
+        except (DeadlineExceeded, TurnCancelled):
+            raise
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -180,11 +280,13 @@ class A2AClient:
             print(f"💬 Sending chat message to: {self.endpoints['chat']}")
             print(f"📝 Message: {message[:100]}{'...' if len(message) > 100 else ''}")
             
-            response = requests.post(
-                self.endpoints["chat"],
-                headers=self.get_headers(),
-                json=payload
-            )
+            with get_deadline().stage("a2a chat"):
+                response = requests.post(
+                    self.endpoints["chat"],
+                    headers=self.get_headers(),
+                    json=payload,
+                    timeout=request_timeout("a2a chat")
+                )
             
             print(f"📊 Chat response status: {response.status_code}")
             
@@ -199,11 +301,125 @@ class A2AClient:
                     error_msg = f"Chat request failed: {response.status_code} - {response.text}"
                 return {"success": False, "error": error_msg}
                 
+        except (DeadlineExceeded, TurnCancelled):
+            raise
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-@tool
-def chat_with_a2a_agent(message: str) -> str:
+class A2AHealthProber:
+    """Polls agent health endpoints in the background and caches the results.
+    
+    Each probe updates a per-agent snapshot with the last status, latency and
+    an exponentially weighted moving average of latency, so callers can answer
+    health questions or skip requests to a known-down agent without waiting on
+    the network.
+    """
+    
+    UNHEALTHY_STATUSES = ("unhealthy", "unreachable")
+    
+    def __init__(self, clients: Dict[str, A2AClient], interval: float, jitter: float, ewma_alpha: float = 0.3):
+        self.clients = clients
+        self.interval = interval
+        self.jitter = jitter
+        self.ewma_alpha = ewma_alpha
+        self.snapshot: Dict[str, Dict[str, Any]] = {}
+    
+    def probe(self, agent_id: str) -> Dict[str, Any]:
+        """Probe one agent synchronously and record the result in the snapshot."""
+        # A probe never outlives the interval, whatever turn may be running
+        token = current_deadline.set(TurnDeadline(self.interval))
+        try:
+            started = time.perf_counter()
+            result = self.clients[agent_id].check_health()
+            latency_ms = (time.perf_counter() - started) * 1000
+        finally:
+            current_deadline.reset(token)
+        
+        previous = self.snapshot.get(agent_id, {})
+        previous_ewma = previous.get("latency_ewma_ms")
+        if result["success"]:
+            status = result["data"].get("status", "unknown")
+            error = None
+        else:
+            status = result.get("status", "unreachable")
+            error = result["error"]
+        
+        entry = {
+            "agent_id": agent_id,
+            "status": status,
+            "error": error,
+            "details": result.get("data"),
+            "checked_at": time.time(),
+            "latency_ms": latency_ms,
+            "latency_ewma_ms": latency_ms if previous_ewma is None
+            else self.ewma_alpha * latency_ms + (1 - self.ewma_alpha) * previous_ewma,
+            "consecutive_failures": 0 if result["success"] else previous.get("consecutive_failures", 0) + 1
+        }
+        # Replace the entry in one assignment; tool threads read it concurrently
+        self.snapshot[agent_id] = entry
+        return entry
+    
+    def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the cached health entry for an agent, if it has been probed."""
+        return self.snapshot.get(agent_id)
+    
+    def get_fresh(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the cached health entry if it is no older than three intervals.
+        
+        Older entries mean the background loop isn't running (batch runs,
+        benchmarks, imports) or is falling behind, so they aren't trusted.
+        """
+        entry = self.snapshot.get(agent_id)
+        if entry and time.time() - entry["checked_at"] <= 3 * self.interval:
+            return entry
+        return None
+    
+    def is_known_unhealthy(self, agent_id: str) -> bool:
+        """Whether a recent probe found the agent down.
+        
+        Entries older than three intervals are treated as unknown rather than
+        unhealthy so a stale snapshot never blocks requests.
+        """
+        entry = self.get_fresh(agent_id)
+        return entry is not None and entry["status"] in self.UNHEALTHY_STATUSES
+    
+    async def run(self):
+        """Probe all agents concurrently, then sleep for the jittered interval, until cancelled."""
+        while True:
+            await asyncio.gather(
+                *(asyncio.to_thread(self.probe, agent_id) for agent_id in self.clients),
+                return_exceptions=True
+            )
+            spread = self.interval * self.jitter
+            await asyncio.sleep(max(0.0, self.interval + random.uniform(-spread, spread)))
+
+# One client shared by all tool calls so the access token is reused until it expires
+a2a_client = A2AClient(A2A_AGENT_ID, A2A_CLIENT_ID, A2A_CLIENT_SECRET, A2A_BASE_URL)
+
+health_prober = A2AHealthProber(
+    {
+        agent_id: a2a_client if agent_id == A2A_AGENT_ID
+        else A2AClient(agent_id, A2A_CLIENT_ID, A2A_CLIENT_SECRET, A2A_BASE_URL)
+        for agent_id in A2A_HEALTH_AGENT_IDS
+    },
+    interval=A2A_HEALTH_INTERVAL,
+    jitter=A2A_HEALTH_JITTER
+)
+
+async def keep_token_fresh(client: A2AClient, retry_after: float = 30.0):
+    """Authenticate in the background and again just before the token expires.
+    
+    Runs while the REPL waits for input, so turns find a valid token instead
+    of paying for the token exchange themselves.
+    """
+    while True:
+        # Quietly: a refresh prints nothing over the prompt the user is typing at
+        authenticated = await asyncio.to_thread(client.ensure_authenticated, quiet=True)
+        # token_expires_at is already a minute early, so waking then leaves time to refresh
+        await asyncio.sleep(max(1.0, client.token_expires_at - time.time()) if authenticated else retry_after)
+
+@tool(response_format="content_and_artifact")
+def chat_with_a2a_agent(message: str) -> Tuple[str, Dict[str, Any]]:
     """
     Chat with an A2A agent through the LaunchpadAI A2A interface.
     
@@ -211,17 +427,21 @@ def chat_with_a2a_agent(message: str) -> str:
         message: The message to send to the A2A agent
         
     Returns:
-        Response from the A2A agent
+        Response from the A2A agent, plus the full response (with its
+        metadata) as the tool artifact
     """
-    # Initialize A2A client
-    client = A2AClient(A2A_AGENT_ID, A2A_CLIENT_ID, A2A_CLIENT_SECRET, A2A_BASE_URL)
+    # Fail fast when the background prober already knows the agent is down
+    if health_prober.is_known_unhealthy(A2A_AGENT_ID):
+        health = health_prober.get(A2A_AGENT_ID)
+        age = time.time() - health["checked_at"]
+        return tool_error(f"❌ A2A agent is {health['status']} (checked {age:.0f}s ago: {health['error']}). Message not sent.")
     
-    # Authenticate
-    if not client.authenticate():
-        return "❌ Failed to authenticate with A2A service. Please check your credentials."
+    # Authenticate (reuses the cached token while it is valid)
+    if not a2a_client.ensure_authenticated():
+        return tool_error("❌ Failed to authenticate with A2A service. Please check your credentials.")
     
     # Send chat message
-    result = client.chat(message)
+    result = a2a_client.chat(message)
     
     if result["success"]:
         response_data = result["data"]
@@ -230,78 +450,89 @@ def chat_with_a2a_agent(message: str) -> str:
         conversation_id = metadata.get("conversation_id", "Unknown")
         agent_name = metadata.get("agent_name", "A2A Agent")
         
-        return f"🤖 {agent_name} Response:\n{agent_response}\n\n📝 Conversation ID: {conversation_id}"
+        return f"🤖 {agent_name}: {agent_response}\n(conversation {conversation_id})", response_data
     else:
-        return f"❌ Chat failed: {result['error']}"
+        return tool_error(f"❌ Chat failed: {result['error']}")
 
-@tool
-def check_a2a_agent_health() -> str:
+@tool(response_format="content_and_artifact")
+def check_a2a_agent_health() -> Tuple[str, Dict[str, Any]]:
     """
     Check the health status of the A2A agent.
     
     Returns:
-        Health status of the A2A agent
+        Health status of the A2A agent with any failing checks, plus the
+        full health snapshot as the tool artifact
     """
-    # Initialize A2A client
-    client = A2AClient(A2A_AGENT_ID, A2A_CLIENT_ID, A2A_CLIENT_SECRET, A2A_BASE_URL)
-    
-    # Authenticate
-    if not client.authenticate():
-        return "❌ Failed to authenticate with A2A service. Please check your credentials."
-    
-    # Check health
-    result = client.check_health()
+    # Answer from the background prober's snapshot; probe now if it is missing or stale
+    health = health_prober.get_fresh(A2A_AGENT_ID) or health_prober.probe(A2A_AGENT_ID)
     
-    if result["success"]:
-        health_data = result["data"]
-        status = health_data.get("status", "unknown")
-        return f"🏥 A2A Agent Health: {status}\n📊 Details: {json.dumps(health_data, indent=2)}"
+    age = time.time() - health["checked_at"]
+    latency = f"latency {health['latency_ms']:.0f} ms (avg {health['latency_ewma_ms']:.0f} ms)"
+    if health["error"] is None:
+        # Only checks that didn't pass are worth the model's attention
+        checks = (health["details"] or {}).get("checks", {})
+        problems = [
+            f"{name}: {check.get('status')}" for name, check in checks.items()
+            if isinstance(check, dict) and check.get("status") != "pass"
+        ]
+        summary = f"🏥 A2A Agent Health: {health['status']} (checked {age:.0f}s ago, {latency})"
+        if problems:
+            summary += f"\nChecks not passing: {', '.join(problems)}"
+        # Only failed checks carry an "error" in the artifact
+        return summary, {key: value for key, value in health.items() if key != "error"}
     else:
-        return f"❌ Health check failed: {result['error']}"
+        return f"❌ Health check failed: {health['error']} (status: {health['status']}, checked {age:.0f}s ago, {latency})", health
 
-@tool
-def get_a2a_agent_capabilities() -> str:
+@tool(response_format="content_and_artifact")
+def get_a2a_agent_capabilities() -> Tuple[str, Dict[str, Any]]:
     """
     Get the capabilities of the A2A agent.
     
     Returns:
-        Capabilities of the A2A agent
+        The agent's name and a one-line description of each capability, plus
+        the full capabilities document (with parameters) as the tool artifact
     """
-    # Initialize A2A client
-    client = A2AClient(A2A_AGENT_ID, A2A_CLIENT_ID, A2A_CLIENT_SECRET, A2A_BASE_URL)
-    
-    # Authenticate
-    if not client.authenticate():
-        return "❌ Failed to authenticate with A2A service. Please check your credentials."
+    # Authenticate (reuses the cached token while it is valid)
+    if not a2a_client.ensure_authenticated():
+        return tool_error("❌ Failed to authenticate with A2A service. Please check your credentials.")
     
     # Get capabilities
-    result = client.get_capabilities()
+    result = a2a_client.get_capabilities()
     
     if result["success"]:
         capabilities_data = result["data"]
-        return f"🔧 A2A Agent Capabilities:\n{json.dumps(capabilities_data, indent=2)}"
+        lines = [f"🔧 {capabilities_data.get('agent_name', 'A2A Agent')} capabilities:"]
+        if capabilities_data.get("agent_description"):
+            lines[0] += f" {capabilities_data['agent_description']}"
+        for capability in capabilities_data.get("capabilities", []):
+            if isinstance(capability, dict):
+                description = capability.get("description")
+                lines.append(f"- {capability.get('name')}" + (f": {description}" if description else ""))
+            else:
+                lines.append(f"- {capability}")
+        return "\n".join(lines), capabilities_data
     else:
-        return f"❌ Capabilities request failed: {result['error']}"
+        return tool_error(f"❌ Capabilities request failed: {result['error']}")
 
 # Define the tools
 tools = [chat_with_a2a_agent, check_a2a_agent_health, get_a2a_agent_capabilities]
 
-# Create the LLM with tools
+# Create the model tiers: a temperature-0 router bound to the tools picks
+# tool calls, and the synthesis model writes the answers
+router_llm = ChatOpenAI(
+    model=ROUTER_MODEL,
+    temperature=ROUTER_TEMPERATURE,
+    api_key=os.environ.get("OPENAI_API_KEY")
+)
+llm_with_tools = router_llm.bind_tools(tools)
 llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
+    model=SYNTHESIS_MODEL,
+    temperature=SYNTHESIS_TEMPERATURE,
     api_key=os.environ.get("OPENAI_API_KEY")
 )
-llm_with_tools = llm.bind_tools(tools)
 
-# Define the agent node
-def agent_node(state: AgentState) -> AgentState:
-    """The main agent node that processes messages and decides on tool usage."""
-    messages = state["messages"]
-    
-    # Add system message if this is the first interaction
-    if not any(isinstance(msg, SystemMessage) for msg in messages):
-        system_message = SystemMessage(content="""You are an AI assistant that can interact with other AI agents through the LaunchpadAI A2A (Agent-to-Agent) interface.
+# System prompt for the agent
+SYSTEM_PROMPT = """You are an AI assistant that can interact with other AI agents through the LaunchpadAI A2A (Agent-to-Agent) interface.
 
 Your capabilities:
 1. Use 'chat_with_a2a_agent' to send messages to the A2A agent and get responses
@@ -309,28 +540,13 @@ Your capabilities:
 3. Use 'get_a2a_agent_capabilities' to discover what the A2A agent can do
 4. You can have conversations with the A2A agent and relay information back to the user
 
-The A2A interface uses OAuth2 authentication and provides a standardized way for agents to communicate with each other.""")
-        messages = [system_message] + messages
-    
-    # Get response from LLM
-    response = llm_with_tools.invoke(messages)
-    
-    return {"messages": [response]}
+The A2A interface uses OAuth2 authentication and provides a standardized way for agents to communicate with each other."""
 
-# Define the tool node
-tool_node = ToolNode(tools)
-
-# Define the conditional edge function
-def should_continue(state: AgentState) -> str:
-    """Determine whether to continue with tool calls or end."""
-    messages = state["messages"]
-    last_message = messages[-1]
-    
-    # If the last message has tool calls, go to tools
-    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-        return "tools"
-    # Otherwise, end
-    return END
+# Define the nodes: the agent, the budgeted tool runner, and the fallback
+# that answers without tools once the per-turn budget is used up
+agent_node = make_agent_node(llm_with_tools, SYSTEM_PROMPT, synthesis_llm=llm if SPLIT_MODEL_TIERS else None)
+tool_node = make_tool_node(tools)
+finalize_node = make_finalize_node(llm, SYSTEM_PROMPT)
 
 # Create the graph
 workflow = StateGraph(AgentState)
@@ -338,6 +554,7 @@ workflow = StateGraph(AgentState)
 # Add nodes
 workflow.add_node("agent", agent_node)
 workflow.add_node("tools", tool_node)
+workflow.add_node("finalize", finalize_node)
 
 # Set entry point
 workflow.set_entry_point("agent")
@@ -348,12 +565,14 @@ workflow.add_conditional_edges(
     should_continue,
     {
         "tools": "tools",
+        "finalize": "finalize",
         END: END
     }
 )
 
 # Add edge from tools back to agent
 workflow.add_edge("tools", "agent")
+workflow.add_edge("finalize", END)
 
 # Compile the graph
 app = workflow.compile()
@@ -394,14 +613,25 @@ async def main():
     if not verify_configuration():
         return
     
+    reader = AsyncLineReader()
+    background = BackgroundTasks()
+    # Keep a cached health snapshot warm for the health tool and fail-fast chat
+    background.start(health_prober.run(), "a2a health probes")
+    background.start(keep_token_fresh(a2a_client), "a2a token refresh")
+    
     print("Type \033[33mexit\033[0m or \033[33mquit\033[0m to exit, \033[33mhelp\033[0m for instructions\n")
     
     while True:
         try:
-            user_input = input("\033[1m\033[32mYou:\033[0m ")
+            # Background tasks keep running while we wait for the user
+            user_input = await reader.readline("\033[1m\033[32mYou:\033[0m ")
             
             # Handle special commands
             if user_input.lower() in ["exit", "quit", "q"]:
+                if format_loop_metrics():
+                    print(f"\033[90mLoop guard: {format_loop_metrics()}\033[0m")
+                if accounting.format_tiers():
+                    print(f"\033[90mModel tiers: {accounting.format_tiers()}\033[0m")
                 print("Goodbye!")
                 break
             
@@ -409,6 +639,10 @@ async def main():
                 print("\n\033[1mCommands:\033[0m")
                 print("  help, ?       - Show this help message")
                 print("  exit, quit, q - Exit the agent")
+                print("  profile       - Toggle per-turn CPU and allocation profiling")
+                print("  tasks         - List background tasks")
+                print("  stats         - Show token, request and latency totals for this session")
+                print("  stats > FILE  - Export them, with every turn, as JSON")
                 print("\033[1mCapabilities:\033[0m")
                 print("  - Chat with A2A agents")
                 print("  - Check A2A agent health")
@@ -417,6 +651,27 @@ async def main():
                 print("  - Press Ctrl+C at any time to interrupt\n")
                 continue
             
+            if user_input.lower() == "profile":
+                state = "on" if profiler.toggle() else "off"
+                print(f"\033[90mProfiling {state} (reports go to {profiler.directory})\033[0m\n")
+                continue
+            
+            # Only a bare "stats" or "stats > FILE" is a command; questions starting with "stats" go to the agent
+            command, _, path = user_input.partition(">")
+            if command.strip().lower() == "stats":
+                path = path.strip()
+                if path:
+                    accounting.export_json(path)
+                    print(f"\033[90mSession stats written to {path}\033[0m\n")
+                else:
+                    print(f"\033[90m{accounting.format_stats()}\033[0m\n")
+                continue
+            
+            if user_input.lower() == "tasks":
+                running = background.running()
+                print(f"\033[90mBackground tasks: {', '.join(running) if running else 'none'}\033[0m\n")
+                continue
+            
             if not user_input.strip():
                 continue
             
@@ -427,8 +682,11 @@ async def main():
                 "messages": [HumanMessage(content=user_input)]
             }
             
-            # Run the graph
-            final_state = await app.ainvoke(initial_state)
+            # Run the graph under a per-turn deadline; Ctrl+C cancels only this turn
+            with accounting.turn(user_input), profiler.turn(user_input) as profile:
+                final_state = await run_turn(app.ainvoke(initial_state), TurnDeadline())
+            if profile:
+                print(f"\033[90m📈 Profile written to {profile.report_path}\033[0m")
             
             # Get the final response
             final_message = final_state["messages"][-1]
@@ -437,6 +695,10 @@ async def main():
             else:
                 print(f"\n\033[1m\033[34mA2A Agent Interface:\033[0m {final_message}\n")
             
+        except DeadlineExceeded as e:
+            print(f"\n\033[31m⏱️ {e}\033[0m\n")
+        except TurnCancelled as e:
+            print(f"\n\033[33m{e}\nType 'exit' to quit or continue with a new query.\033[0m")
         except KeyboardInterrupt:
             print("\n\033[33mOperation interrupted. Type 'exit' to quit or continue with a new query.\033[0m")
         except EOFError:
@@ -444,10 +706,24 @@ async def main():
             break
         except Exception as e:
             print(f"\n\033[31mError: {e}\033[0m\n")
+    
+    await background.stop()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LangGraph agent with A2A integration")
+    parser.add_argument("--profile", action="store_true", help="Write a CPU and allocation profile of every turn to PROFILE_DIR")
+    parser.add_argument("--stats-json", metavar="FILE", help="Write token, request and latency stats to FILE on exit")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable()
+    
     try:
-        asyncio.run(main())
+        # Records or replays HTTP traffic when LAUNCHPAD_CASSETTE is set
+        with cassette_from_env():
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\033[33mExiting...\033[0m")
-        sys.exit(0) 
\ No newline at end of file
+        sys.exit(0) 
+    finally:
+        if args.stats_json:
+            accounting.export_json(args.stats_json)
@@ -1,18 +1,46 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
+import itertools
 import json
 import os
-import subprocess
+import requests
 import sys
-from typing import Dict, Any, List, TypedDict, Annotated
+import threading
+from typing import Dict, Any, List, Optional, Tuple, TypedDict, Annotated
 from dotenv import load_dotenv
 
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.tools import tool
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
+
+from launchpad_accounting import accounting
+from launchpad_cassette import cassette_from_env
+from launchpad_deadline import (
+    DeadlineExceeded,
+    TurnCancelled,
+    TurnDeadline,
+    get_deadline,
+    request_timeout,
+    run_turn,
+)
+from launchpad_graph import (
+    ROUTER_MODEL,
+    ROUTER_TEMPERATURE,
+    SPLIT_MODEL_TIERS,
+    SYNTHESIS_MODEL,
+    SYNTHESIS_TEMPERATURE,
+    format_loop_metrics,
+    make_agent_node,
+    make_finalize_node,
+    make_tool_node,
+    should_continue,
+    tool_error,
+)
+from launchpad_profile import profiler
+from launchpad_repl import AsyncLineReader, BackgroundTasks
 
 # Load environment variables from .env.local
 load_dotenv("./.env.local")
@@ -27,8 +55,202 @@ MCP_SERVER_URL = f"{MCP_BASE_URL}/api/mcp/agents/{MCP_AGENT_ID}"
 class AgentState(TypedDict):
     messages: Annotated[List[Any], add_messages]
 
-@tool
-def launchpad_chat(message: str) -> str:
+class McpSessionError(Exception):
+    """Raised when the MCP server answers with something that is not JSON-RPC."""
+
+class McpSession:
+    """MCP client session over the Streamable HTTP transport.
+
+    The session runs the initialize handshake once, sends the server-issued
+    Mcp-Session-Id on every later request, caches the tools/list result and
+    accepts both plain JSON and SSE-streamed responses. A dropped connection or
+    an expired session triggers a single re-initialize and retry.
+    """
+    
+    PROTOCOL_VERSION = "2024-11-05"
+    
+    def __init__(self, url: str, api_key: str):
+        self.url = url
+        self.api_key = api_key
+        self.http = requests.Session()
+        self.session_id: Optional[str] = None
+        self.server_info: Dict[str, Any] = {}
+        self.initialized = False
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def _headers(self) -> Dict[str, str]:
+        """Get headers for a request within this session."""
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "x-api-key": self.api_key
+        }
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        return headers
+    
+    def _read_message(self, response: requests.Response, request_id: int) -> Dict[str, Any]:
+        """Read the JSON-RPC response for request_id from a JSON or SSE body."""
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.startswith("text/event-stream"):
+            try:
+                return response.json()
+            except ValueError:
+                raise McpSessionError(f"Invalid JSON response: {response.text}")
+        
+        # SSE: events are separated by blank lines, payload is in data: lines.
+        # Server notifications (progress, logging) may precede the response.
+        data_lines: List[str] = []
+        for line in itertools.chain(response.iter_lines(decode_unicode=True), [""]):
+            if line:
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                continue
+            if not data_lines:
+                continue
+            try:
+                message = json.loads("\n".join(data_lines))
+            except json.JSONDecodeError:
+                raise McpSessionError(f"Invalid SSE event: {data_lines}")
+            data_lines = []
+            if message.get("id") == request_id:
+                response.close()
+                return message
+            # The read timeout only bounds each chunk, so check the turn between events
+            get_deadline().check("mcp stream")
+        raise McpSessionError(f"Stream ended without a response to request {request_id}")
+    
+    def _send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one JSON-RPC request and return the matching response."""
+        request_id = next(self._ids)
+        payload = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            payload["params"] = params
+        
+        stage = f"mcp {method}"
+        with get_deadline().stage(stage):
+            response = self.http.post(
+                self.url,
+                headers=self._headers(),
+                json=payload,
+                stream=True,
+                timeout=request_timeout(stage)
+            )
+            if response.status_code == 404 and self.session_id:
+                # The server no longer knows our session; the caller re-initializes
+                raise requests.ConnectionError(f"MCP session {self.session_id} expired")
+            return self._read_message(response, request_id)
+    
+    def initialize(self) -> Dict[str, Any]:
+        """Run the MCP initialize handshake and remember the session id."""
+        with self._lock:
+            if self.initialized:
+                return self.server_info
+            
+            self.session_id = None
+            request_id = next(self._ids)
+            with get_deadline().stage("mcp initialize"):
+                self._handshake(request_id)
+            
+            self.initialized = True
+            return self.server_info
+    
+    def _handshake(self, request_id: int):
+        """Send initialize and notifications/initialized."""
+        response = self.http.post(
+            self.url,
+            headers=self._headers(),
+            json={
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": self.PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "langgraph-mcp-agent", "version": "1.0.0"}
+                }
+            },
+            stream=True,
+            timeout=request_timeout("mcp initialize")
+        )
+        self.session_id = response.headers.get("Mcp-Session-Id")
+        message = self._read_message(response, request_id)
+        if "error" in message:
+            # HTTP-level failures (bad API key, unknown agent) use a plain string
+            error = message["error"]
+            error_msg = error.get("message") if isinstance(error, dict) else error
+            raise McpSessionError(f"MCP initialize failed: {error_msg}")
+        
+        self.server_info = message.get("result", {}).get("serverInfo", {})
+        
+        # Notifications carry no id and get no JSON-RPC response
+        self.http.post(
+            self.url,
+            headers=self._headers(),
+            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+            timeout=request_timeout("mcp initialize")
+        ).close()
+    
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a request within the session, reconnecting once if it was dropped."""
+        self.initialize()
+        try:
+            return self._send(method, params)
+        except requests.ConnectionError:
+            self.initialized = False
+            self.initialize()
+            return self._send(method, params)
+    
+    def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get the server's tools, cached for the life of the session."""
+        if self._tools is None or refresh:
+            response = self.request("tools/list")
+            if "error" in response:
+                raise McpSessionError(f"MCP Error: {response['error']['message']}")
+            self._tools = response.get("result", {}).get("tools", [])
+        return self._tools
+    
+    def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a server tool and return the raw JSON-RPC response."""
+        if self._tools is not None and name not in {t.get("name") for t in self._tools}:
+            raise McpSessionError(f"Unknown tool: {name}")
+        return self.request("tools/call", {"name": name, "arguments": arguments})
+    
+    def close(self):
+        """Terminate the session on the server and release the connection pool."""
+        if self.session_id:
+            try:
+                self.http.delete(self.url, headers=self._headers(), timeout=5).close()
+            except requests.RequestException:
+                pass
+        self.session_id = None
+        self.initialized = False
+        self.http.close()
+
+# One session shared by every tool call for the life of the process
+mcp_session = McpSession(MCP_SERVER_URL, AGENT_MCP_API_KEY)
+
+def _content_parts(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Content parts of a tools/call result, normalized to a list of dicts."""
+    content = response["result"]["content"]
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    if isinstance(content, list):
+        return [item for item in content if isinstance(item, dict)]
+    return []
+
+def _response_error(response: Dict[str, Any]) -> Optional[str]:
+    """Error message for a tools/call response without usable content."""
+    if "result" in response and "content" in response["result"]:
+        return None
+    if "error" in response:
+        return f"MCP Error: {response['error']['message']}"
+    return f"Unexpected response format: {response}"
+
+@tool(response_format="content_and_artifact")
+def launchpad_chat(message: str) -> Tuple[str, Dict[str, Any]]:
     """
     Chat with the LaunchpadAI agent through the MCP server.
     
@@ -36,168 +258,117 @@ def launchpad_chat(message: str) -> str:
         message: The message to send to the LaunchpadAI agent
         
     Returns:
-        The response from the LaunchpadAI agent
+        The response from the LaunchpadAI agent, plus the raw content parts
+        (and any structured content) as the tool artifact
     """
-    # Prepare the JSON-RPC 2.0 request payload for the chat tool
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "chat",
-            "arguments": {
-                "message": message
-            }
-        }
-    }
-    
-    # Execute curl command to send the request
-    cmd = [
-        "curl", "-s",
-        "-X", "POST",
-        MCP_SERVER_URL,
-        "-H", "Content-Type: application/json",
-        "-H", f"x-api-key: {AGENT_MCP_API_KEY}",
-        "-d", json.dumps(payload)
-    ]
-    
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return f"Error calling LaunchpadAI: {result.stderr}"
-            
-        # Try to parse the response
-        print(f"[DEBUG] Raw stdout length: {len(result.stdout)} chars")
-        print(f"[DEBUG] Raw stdout: {repr(result.stdout)}")
         try:
-            response = json.loads(result.stdout)
-            # Handle JSON-RPC 2.0 response format
-            if "result" in response and "content" in response["result"]:
-                # Extract text from the content array
-                content = response["result"]["content"]
-                if isinstance(content, list):
-                    # Combine all text content from all parts with proper formatting
-                    full_text = []
-                    print(f"[DEBUG] Raw response: {json.dumps(response, indent=2)}")
-                    print(f"[DEBUG] Found {len(content)} content parts")
-                    
-                    for i, item in enumerate(content):
-                        print(f"[DEBUG] Part {i+1}: {type(item)} - {item}")
-                        if isinstance(item, dict):
-                            text = item.get("text", "")
-                            print(f"[DEBUG] Part {i+1} text length: {len(text)} chars")
-                            if text:
-                                print(f"[DEBUG] Part {i+1} first 200 chars: {repr(text[:200])}")
-                                print(f"[DEBUG] Part {i+1} last 200 chars: {repr(text[-200:])}")
-                                if text.strip():  # Only add non-empty text
-                                    full_text.append(text.strip())
-                    
-                    # Join with double newlines for better readability
-                    result_text = "\n\n".join(full_text) if full_text else "No text content found"
-                    print(f"[DEBUG] Combined {len(full_text)} text parts")
-                    print(f"[DEBUG] Final combined text length: {len(result_text)} chars")
-                    print(f"[DEBUG] Final text first 200 chars: {repr(result_text[:200])}")
-                    print(f"[DEBUG] Final text last 200 chars: {repr(result_text[-200:])}")
-                    return result_text
-                elif isinstance(content, str):
-                    # Handle single string content
-                    return content
-                else:
-                    return "No content found in response"
-            elif "error" in response:
-                return f"MCP Error: {response['error']['message']}"
-            else:
-                return f"Unexpected response format: {response}"
-        except json.JSONDecodeError:
-            return f"Invalid JSON response: {result.stdout}"
+            response = mcp_session.call_tool("chat", {"message": message})
+        except requests.RequestException as e:
+            return tool_error(f"Error calling LaunchpadAI: {e}")
+        
+        error = _response_error(response)
+        if error:
+            return tool_error(error)
+        
+        # Combine all text content from all parts with proper formatting
+        parts = _content_parts(response)
+        full_text = []
+        print(f"[DEBUG] Found {len(parts)} content parts")
+        
+        for i, item in enumerate(parts):
+            text = item.get("text", "")
+            print(f"[DEBUG] Part {i+1} text length: {len(text)} chars")
+            if text.strip():  # Only add non-empty text
+                full_text.append(text.strip())
+        
+        # Join with double newlines for better readability
+        result_text = "\n\n".join(full_text) if full_text else "No text content found"
+        print(f"[DEBUG] Final combined text length: {len(result_text)} chars")
+        return result_text, {
+            "text": result_text,
+            "parts": parts,
+            "structured": response["result"].get("structuredContent")
+        }
+    except (DeadlineExceeded, TurnCancelled):
+        # Let the turn stop instead of reporting a tool error
+        raise
     except Exception as e:
-        return f"Error: {e}"
+        return tool_error(f"Error: {e}")
 
-@tool
-def get_agent_info() -> str:
+@tool(response_format="content_and_artifact")
+def get_agent_info() -> Tuple[str, Dict[str, Any]]:
     """
     Get information about the LaunchpadAI agent.
     
     Returns:
-        Information about the agent's capabilities and configuration
+        A short summary of the agent's capabilities and configuration, plus
+        the full agent info as the tool artifact
     """
-    # Prepare the JSON-RPC 2.0 request payload for the get_agent_info tool
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {
-            "name": "get_agent_info",
-            "arguments": {}
-        }
-    }
-    
-    # Execute curl command to send the request
-    cmd = [
-        "curl", "-s",
-        "-X", "POST",
-        MCP_SERVER_URL,
-        "-H", "Content-Type: application/json",
-        "-H", f"x-api-key: {AGENT_MCP_API_KEY}",
-        "-d", json.dumps(payload)
-    ]
-    
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return f"Error getting agent info: {result.stderr}"
-            
-        # Try to parse the response
         try:
-            response = json.loads(result.stdout)
-            # Handle JSON-RPC 2.0 response format
-            if "result" in response and "content" in response["result"]:
-                # Extract text from the content array
-                content = response["result"]["content"]
-                if isinstance(content, list):
-                    # Combine all text content from all parts and properly format URLs
-                    full_text = []
-                    for item in content:
-                        if isinstance(item, dict):
-                            text = item.get("text", "")
-                            # Clean up URL formatting
-                            text = text.replace("](http", "](hxxp")  # Temporarily mark URLs
-                            text = text.replace("[", "\n[")  # Add newline before links
-                            text = text.replace("](hxxp", "](http")  # Restore URLs
-                            full_text.append(text)
-                    return "\n".join(full_text) if full_text else "No agent info found"
-                elif isinstance(content, str):
-                    return content
-                else:
-                    return "No agent info found in response"
-            elif "error" in response:
-                return f"MCP Error: {response['error']['message']}"
-            else:
-                return f"Unexpected response format: {response}"
-        except json.JSONDecodeError:
-            return f"Invalid JSON response: {result.stdout}"
+            response = mcp_session.call_tool("get_agent_info", {})
+        except requests.RequestException as e:
+            return tool_error(f"Error getting agent info: {e}")
+        
+        error = _response_error(response)
+        if error:
+            return tool_error(error)
+        
+        parts = _content_parts(response)
+        raw_text = "\n".join(item.get("text", "") for item in parts)
+        info = response["result"].get("structuredContent")
+        if info is None:
+            try:
+                info = json.loads(raw_text)
+            except json.JSONDecodeError:
+                info = None
+        
+        if isinstance(info, dict):
+            # One "key: value" line per field instead of indented JSON; nested data stays in the artifact
+            summary = []
+            for key, value in info.items():
+                if isinstance(value, list):
+                    value = ", ".join(str(v.get("name", v)) if isinstance(v, dict) else str(v) for v in value)
+                elif isinstance(value, dict):
+                    continue
+                summary.append(f"{key}: {value}")
+            return "\n".join(summary) or raw_text, info
+        
+        # Plain text info: clean up URL formatting
+        full_text = []
+        for item in parts:
+            text = item.get("text", "")
+            text = text.replace("](http", "](hxxp")  # Temporarily mark URLs
+            text = text.replace("[", "\n[")  # Add newline before links
+            text = text.replace("](hxxp", "](http")  # Restore URLs
+            full_text.append(text)
+        result_text = "\n".join(full_text) if full_text else "No agent info found"
+        return result_text, {"text": result_text, "parts": parts}
+    except (DeadlineExceeded, TurnCancelled):
+        raise
     except Exception as e:
-        return f"Error: {e}"
+        return tool_error(f"Error: {e}")
 
 # Define the tools
 tools = [launchpad_chat, get_agent_info]
 
-# Create the LLM with tools
+# Create the model tiers: a temperature-0 router bound to the tools picks
+# tool calls, and the synthesis model writes the answers
+router_llm = ChatOpenAI(
+    model=ROUTER_MODEL,
+    temperature=ROUTER_TEMPERATURE,
+    api_key=os.environ.get("OPENAI_API_KEY")
+)
+llm_with_tools = router_llm.bind_tools(tools)
 llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
+    model=SYNTHESIS_MODEL,
+    temperature=SYNTHESIS_TEMPERATURE,
     api_key=os.environ.get("OPENAI_API_KEY")
 )
-llm_with_tools = llm.bind_tools(tools)
 
-# Define the agent node
-def agent_node(state: AgentState) -> AgentState:
-    """The main agent node that processes messages and decides on tool usage."""
-    messages = state["messages"]
-    
-    # Add system message if this is the first interaction
-    if not any(isinstance(msg, SystemMessage) for msg in messages):
-        system_message = SystemMessage(content="""You are an AI assistant that has access to a specialized LaunchpadAI agent through MCP tools. 
+# System prompt for the agent
+SYSTEM_PROMPT = """You are an AI assistant that has access to a specialized LaunchpadAI agent through MCP tools. 
 
 Your capabilities:
 1. Use the 'launchpad_chat' tool to send messages to the LaunchpadAI agent for specialized knowledge and responses
@@ -208,28 +379,13 @@ When a user asks a question:
 - If the user wants to know about the agent's capabilities, use the get_agent_info tool
 - For general questions, you can answer directly, but consider if the LaunchpadAI agent might provide better insights
 
-Always be helpful and provide comprehensive responses.""")
-        messages = [system_message] + messages
-    
-    # Get response from LLM
-    response = llm_with_tools.invoke(messages)
-    
-    return {"messages": [response]}
+Always be helpful and provide comprehensive responses."""
 
-# Define the tool node
-tool_node = ToolNode(tools)
-
-# Define the conditional edge function
-def should_continue(state: AgentState) -> str:
-    """Determine whether to continue with tool calls or end."""
-    messages = state["messages"]
-    last_message = messages[-1]
-    
-    # If the last message has tool calls, go to tools
-    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-        return "tools"
-    # Otherwise, end
-    return END
+# Define the nodes: the agent, the budgeted tool runner, and the fallback
+# that answers without tools once the per-turn budget is used up
+agent_node = make_agent_node(llm_with_tools, SYSTEM_PROMPT, synthesis_llm=llm if SPLIT_MODEL_TIERS else None)
+tool_node = make_tool_node(tools)
+finalize_node = make_finalize_node(llm, SYSTEM_PROMPT)
 
 # Create the graph
 workflow = StateGraph(AgentState)
@@ -237,6 +393,7 @@ workflow = StateGraph(AgentState)
 # Add nodes
 workflow.add_node("agent", agent_node)
 workflow.add_node("tools", tool_node)
+workflow.add_node("finalize", finalize_node)
 
 # Set entry point
 workflow.set_entry_point("agent")
@@ -247,23 +404,50 @@ workflow.add_conditional_edges(
     should_continue,
     {
         "tools": "tools",
+        "finalize": "finalize",
         END: END
     }
 )
 
 # Add edge from tools back to agent
 workflow.add_edge("tools", "agent")
+workflow.add_edge("finalize", END)
 
 # Compile the graph
 app = workflow.compile()
 
+async def open_mcp_session():
+    """Open the MCP session and fetch the tool list so the first turn doesn't pay for it."""
+    try:
+        server_info = await asyncio.to_thread(mcp_session.initialize)
+        remote_tools = [t.get("name") for t in await asyncio.to_thread(mcp_session.list_tools)]
+        print(f"\033[90mMCP session {mcp_session.session_id or 'stateless'} open ({server_info.get('name', 'unknown server')}), remote tools: {', '.join(remote_tools)}\033[0m")
+    except Exception as e:
+        print(f"\033[33mCould not open MCP session yet ({e}); will retry on first tool call\033[0m")
+
 async def main():
+    """Main function to run the LangGraph agent with MCP agent integration."""
+    print("\033[1m\033[36mLangGraph Agent with MCP Agent Integration\033[0m")
+    print(f"Connected to: \033[33m{MCP_SERVER_URL}\033[0m")
+    
+    print("Type \033[33mexit\033[0m or \033[33mquit\033[0m to exit, \033[33mhelp\033[0m for instructions\n")
+    
+    reader = AsyncLineReader()
+    background = BackgroundTasks()
+    # Open the MCP session while the user types the first question
+    background.start(open_mcp_session(), "mcp session")
+    
     while True:
         try:
-            user_input = input("\033[1m\033[32mYou:\033[0m ")
+            # Background tasks keep running while we wait for the user
+            user_input = await reader.readline("\033[1m\033[32mYou:\033[0m ")
             
             # Handle special commands
             if user_input.lower() in ["exit", "quit", "q"]:
+                if format_loop_metrics():
+                    print(f"\033[90mLoop guard: {format_loop_metrics()}\033[0m")
+                if accounting.format_tiers():
+                    print(f"\033[90mModel tiers: {accounting.format_tiers()}\033[0m")
                 print("Goodbye!")
                 break
             
@@ -271,6 +455,10 @@ async def main():
                 print("\n\033[1mCommands:\033[0m")
                 print("  help, ?       - Show this help message")
                 print("  exit, quit, q - Exit the agent")
+                print("  profile       - Toggle per-turn CPU and allocation profiling")
+                print("  tasks         - List background tasks")
+                print("  stats         - Show token, request and latency totals for this session")
+                print("  stats > FILE  - Export them, with every turn, as JSON")
                 print("\033[1mCapabilities:\033[0m")
                 print("  - Ask about business, marketing, or startup topics (uses LaunchpadAI)")
                 print("  - Ask about agent capabilities")
@@ -278,6 +466,27 @@ async def main():
                 print("  - Press Ctrl+C at any time to interrupt\n")
                 continue
             
+            if user_input.lower() == "profile":
+                state = "on" if profiler.toggle() else "off"
+                print(f"\033[90mProfiling {state} (reports go to {profiler.directory})\033[0m\n")
+                continue
+            
+            # Only a bare "stats" or "stats > FILE" is a command; questions starting with "stats" go to the agent
+            command, _, path = user_input.partition(">")
+            if command.strip().lower() == "stats":
+                path = path.strip()
+                if path:
+                    accounting.export_json(path)
+                    print(f"\033[90mSession stats written to {path}\033[0m\n")
+                else:
+                    print(f"\033[90m{accounting.format_stats()}\033[0m\n")
+                continue
+            
+            if user_input.lower() == "tasks":
+                running = background.running()
+                print(f"\033[90mBackground tasks: {', '.join(running) if running else 'none'}\033[0m\n")
+                continue
+            
             if not user_input.strip():
                 continue
             
@@ -288,8 +497,11 @@ async def main():
                 "messages": [HumanMessage(content=user_input)]
             }
             
-            # Run the graph
-            final_state = await app.ainvoke(initial_state)
+            # Run the graph under a per-turn deadline; Ctrl+C cancels only this turn
+            with accounting.turn(user_input), profiler.turn(user_input) as profile:
+                final_state = await run_turn(app.ainvoke(initial_state), TurnDeadline())
+            if profile:
+                print(f"\033[90m📈 Profile written to {profile.report_path}\033[0m")
             
             # Get the final response
             final_message = final_state["messages"][-1]
@@ -298,14 +510,36 @@ async def main():
             else:
                 print(f"\n\033[1m\033[34mLangGraph Agent:\033[0m {final_message}\n")
             
+        except DeadlineExceeded as e:
+            print(f"\n\033[31m⏱️ {e}\033[0m\n")
+        except TurnCancelled as e:
+            print(f"\n\033[33m{e}\nType 'exit' to quit or continue with a new query.\033[0m")
         except KeyboardInterrupt:
             print("\n\033[33mOperation interrupted. Type 'exit' to quit or continue with a new query.\033[0m")
+        except EOFError:
+            print("\n\033[33mExiting...\033[0m")
+            break
         except Exception as e:
             print(f"\n\033[31mError: {e}\033[0m\n")
+    
+    await background.stop()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LangGraph agent with MCP agent integration")
+    parser.add_argument("--profile", action="store_true", help="Write a CPU and allocation profile of every turn to PROFILE_DIR")
+    parser.add_argument("--stats-json", metavar="FILE", help="Write token, request and latency stats to FILE on exit")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable()
+    
     try:
-        asyncio.run(main())
+        # Records or replays HTTP traffic when LAUNCHPAD_CASSETTE is set
+        with cassette_from_env():
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\033[33mExiting...\033[0m")
-        sys.exit(0) 
\ No newline at end of file
+        sys.exit(0)
+    finally:
+        mcp_session.close() 
+        if args.stats_json:
+            accounting.export_json(args.stats_json)
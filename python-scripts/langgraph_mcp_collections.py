@@ -1,18 +1,44 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
 import json
 import os
 import subprocess
 import sys
-from typing import Dict, Any, List, TypedDict, Annotated
+from typing import Dict, Any, List, Optional, Tuple, TypedDict, Annotated
 from dotenv import load_dotenv
 
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.tools import tool
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
+
+from launchpad_accounting import accounting
+from launchpad_cache import SharedCache
+from launchpad_cassette import cassette_from_env
+from launchpad_deadline import (
+    DeadlineExceeded,
+    TurnCancelled,
+    TurnDeadline,
+    run_command,
+    run_turn,
+)
+from launchpad_graph import (
+    ROUTER_MODEL,
+    ROUTER_TEMPERATURE,
+    SPLIT_MODEL_TIERS,
+    SYNTHESIS_MODEL,
+    SYNTHESIS_TEMPERATURE,
+    format_loop_metrics,
+    make_agent_node,
+    make_finalize_node,
+    make_tool_node,
+    should_continue,
+    tool_error,
+)
+from launchpad_profile import profiler
+from launchpad_repl import AsyncLineReader
 
 # Load environment variables from .env.local
 load_dotenv("./.env.local")
@@ -23,12 +49,79 @@ MCP_API_KEY = os.getenv("MCP_API_KEY")
 MCP_BASE_URL = os.getenv("MCP_BASE_URL", "http://localhost:3000")
 MCP_SERVER_URL = f"{MCP_BASE_URL}/api/mcp/{MCP_ENDPOINT_ID}"
 
+# Only the fields search_collection actually renders are requested from the
+# endpoint, and chunk content is cut to a snippet server-side. Use get_chunk to
+# fetch the full content of a single result.
+SEARCH_RESULT_FIELDS = [
+    "id",
+    "document_title",
+    "filename",
+    "chunk_content",
+    "relevance_score",
+    "similarity",
+    "vector_similarity",
+]
+SNIPPET_LENGTH = 300
+
+# Optional cache of search results shared between processes (set by launchpad_engine.py)
+search_cache: Optional[SharedCache] = None
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+
 # Define the state for our graph
 class AgentState(TypedDict):
     messages: Annotated[List[Any], add_messages]
 
-@tool
-def search_collection(query: str, limit: int = 10) -> str:
+def _post_to_mcp(payload: Dict[str, Any], stage: str) -> subprocess.CompletedProcess:
+    """POST a JSON payload to the collection's MCP endpoint.
+
+    curl's --compressed negotiates gzip/br with the server and decodes the
+    response transparently. curl is killed if the turn's deadline passes or
+    the turn is cancelled.
+    """
+    body = json.dumps(payload)
+    cmd = [
+        "curl", "-s", "--compressed",
+        "-X", "POST",
+        MCP_SERVER_URL,
+        "-H", "Content-Type: application/json",
+        "-H", f"x-api-key: {MCP_API_KEY}",
+        "-d", body
+    ]
+    # curl bypasses requests, so count the call here; bytes received are after decompression
+    counters = accounting.record_http(len(body.encode()))
+    result = run_command(cmd, stage)
+    accounting.add_bytes_received(counters, len(result.stdout.encode()))
+    return result
+
+def _search_payload(query: str, limit: int) -> Dict[str, Any]:
+    """Search request body, asking only for the fields search_collection renders."""
+    return {
+        "query": query,
+        "limit": limit,
+        "fields": SEARCH_RESULT_FIELDS,
+        "snippet_length": SNIPPET_LENGTH
+    }
+
+def _describe_error(response: Dict[str, Any], prefix: str) -> str:
+    """Turn an error response from the MCP endpoint into a helpful message."""
+    error_msg = response.get("error", "Unknown error occurred")
+    if "Invalid API key" in error_msg:
+        return f"🔑 Authentication failed: {error_msg}\nPlease check your MCP_API_KEY configuration."
+    elif "endpoint not found" in error_msg.lower():
+        return f"🔍 Endpoint not found: {error_msg}\nPlease check your MCP_ENDPOINT_ID configuration."
+    else:
+        return f"{prefix}: {error_msg}"
+
+def _describe_invalid_json(stdout: str) -> str:
+    """Explain a response body that could not be parsed as JSON."""
+    # Check if it's an HTML error page (server not running)
+    if "<html>" in stdout.lower() or "<!doctype" in stdout.lower():
+        return f"🌐 Server appears to be down. Please start the LaunchpadAI development server on port 3000."
+    else:
+        return f"Invalid JSON response: {stdout[:200]}..."
+
+@tool(response_format="content_and_artifact")
+def search_collection(query: str, limit: int = 10) -> Tuple[str, Dict[str, Any]]:
     """
     Search documents in a LaunchpadAI collection through the MCP endpoint.
     
@@ -37,32 +130,26 @@ def search_collection(query: str, limit: int = 10) -> str:
         limit: Maximum number of results to return (default: 10, max: 100)
         
     Returns:
-        Search results from the collection
+        A compact numbered list of matching chunks for the model, plus the
+        parsed results (id, title, score, snippet) as the tool artifact
     """
     # Validate limit
     if limit < 1 or limit > 100:
-        return "Error: Limit must be between 1 and 100"
+        return tool_error("Error: Limit must be between 1 and 100")
     
     # Prepare the request payload
-    payload = {
-        "query": query,
-        "limit": limit
-    }
+    payload = _search_payload(query, limit)
     
-    # Execute curl command to send the request
-    cmd = [
-        "curl", "-s",
-        "-X", "POST",
-        MCP_SERVER_URL,
-        "-H", "Content-Type: application/json",
-        "-H", f"x-api-key: {MCP_API_KEY}",
-        "-d", json.dumps(payload)
-    ]
+    cache_key = f"search:{MCP_ENDPOINT_ID}:{json.dumps(payload, sort_keys=True)}"
+    if search_cache is not None:
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return cached[0], cached[1]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = _post_to_mcp(payload, "search_collection")
         if result.returncode != 0:
-            return f"Error calling MCP endpoint: {result.stderr}"
+            return tool_error(f"Error calling MCP endpoint: {result.stderr}")
             
         # Try to parse the response
         try:
@@ -71,90 +158,114 @@ def search_collection(query: str, limit: int = 10) -> str:
             if response.get("success"):
                 results = response.get("results", [])
                 if not results:
-                    return "No documents found matching your query. This could mean:\n- The collection is empty\n- Your search terms don't match any documents\n- The collection hasn't been indexed yet"
+                    # Not cached: the collection may still be indexing
+                    return "No documents found matching your query. The collection may be empty, not indexed yet, or have no match for these terms.", {"query": query, "results": []}
                 
-                # Format the results for better readability
-                formatted_results = []
-                for i, doc in enumerate(results[:limit], 1):
+                # Normalize the results, then render one compact line per result
+                documents = []
+                for doc in results[:limit]:
                     # Use the correct field names from the MCP endpoint response
-                    title = doc.get("document_title", doc.get("filename", "Untitled"))
-                    content = doc.get("chunk_content", "No content available")
-                    score = doc.get("relevance_score", doc.get("similarity", doc.get("vector_similarity", 0)))
-                    
-                    # Truncate content if too long
-                    if len(content) > 300:
-                        content = content[:300] + "..."
-                    
-                    formatted_results.append(
-                        f"{i}. **{title}** (Score: {score:.3f})\n{content}\n"
-                    )
+                    content = doc.get("chunk_content", "")
+                    # Older servers ignore snippet_length, so truncate here as well
+                    truncated = bool(doc.get("content_truncated")) or len(content) > SNIPPET_LENGTH
+                    documents.append({
+                        "id": doc.get("id"),
+                        "title": doc.get("document_title", doc.get("filename", "Untitled")),
+                        "score": doc.get("relevance_score", doc.get("similarity", doc.get("vector_similarity", 0))),
+                        "snippet": content[:SNIPPET_LENGTH],
+                        "truncated": truncated
+                    })
                 
-                return f"Found {len(results)} documents:\n\n" + "\n".join(formatted_results)
+                lines = [
+                    f"{i}. {doc['title']} [score {doc['score']:.3f}, chunk {doc['id']}] "
+                    f"{doc['snippet']}{'...' if doc['truncated'] else ''}"
+                    for i, doc in enumerate(documents, 1)
+                ]
+                summary = f"Found {len(results)} documents:\n" + "\n".join(lines)
+                artifact = {"query": query, "results": documents}
+                if search_cache is not None:
+                    search_cache.set(cache_key, [summary, artifact], SEARCH_CACHE_TTL)
+                return summary, artifact
             else:
-                error_msg = response.get("error", "Unknown error occurred")
-                if "Invalid API key" in error_msg:
-                    return f"🔑 Authentication failed: {error_msg}\nPlease check your MCP_API_KEY configuration."
-                elif "not found" in error_msg.lower():
-                    return f"🔍 Endpoint not found: {error_msg}\nPlease check your MCP_ENDPOINT_ID configuration."
-                else:
-                    return f"Search failed: {error_msg}"
+                return tool_error(_describe_error(response, "Search failed"))
                 
         except json.JSONDecodeError:
-            # Check if it's an HTML error page (server not running)
-            if "<html>" in result.stdout.lower() or "<!doctype" in result.stdout.lower():
-                return f"🌐 Server appears to be down. Please start the LaunchpadAI development server on port 3000."
+            return tool_error(_describe_invalid_json(result.stdout))
+    except (DeadlineExceeded, TurnCancelled):
+        # Let the turn stop instead of reporting a tool error
+        raise
+    except Exception as e:
+        return tool_error(f"Error: {e}")
+
+@tool(response_format="content_and_artifact")
+def get_chunk(chunk_id: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the full content of a single document chunk returned by search_collection.
+    
+    Args:
+        chunk_id: The chunk id shown next to a search result
+        
+    Returns:
+        The complete chunk content with its document title, plus the chunk
+        record as the tool artifact
+    """
+    try:
+        result = _post_to_mcp({"chunk_id": chunk_id}, "get_chunk")
+        if result.returncode != 0:
+            return tool_error(f"Error calling MCP endpoint: {result.stderr}")
+        
+        try:
+            response = json.loads(result.stdout)
+            
+            if response.get("success"):
+                chunk = response.get("chunk", {})
+                title = chunk.get("document_title", chunk.get("filename", "Untitled"))
+                content = chunk.get("chunk_content", "No content available")
+                position = f"part {chunk.get('chunk_index', 0) + 1} of {chunk.get('total_chunks', '?')}"
+                return f"{title} ({position})\n{content}", chunk
             else:
-                return f"Invalid JSON response: {result.stdout[:200]}..."
+                return tool_error(_describe_error(response, "Chunk lookup failed"))
+                
+        except json.JSONDecodeError:
+            return tool_error(_describe_invalid_json(result.stdout))
+    except (DeadlineExceeded, TurnCancelled):
+        raise
     except Exception as e:
-        return f"Error: {e}"
+        return tool_error(f"Error: {e}")
 
 # Define the tools
-tools = [search_collection]
+tools = [search_collection, get_chunk]
 
-# Create the LLM with tools
+# Create the model tiers: a temperature-0 router bound to the tools picks
+# tool calls, and the synthesis model writes the answers
+router_llm = ChatOpenAI(
+    model=ROUTER_MODEL,
+    temperature=ROUTER_TEMPERATURE,
+    api_key=os.getenv("OPENAI_API_KEY")
+)
+llm_with_tools = router_llm.bind_tools(tools)
 llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
+    model=SYNTHESIS_MODEL,
+    temperature=SYNTHESIS_TEMPERATURE,
     api_key=os.getenv("OPENAI_API_KEY")
 )
-llm_with_tools = llm.bind_tools(tools)
 
-# Define the agent node
-def agent_node(state: AgentState) -> AgentState:
-    """The main agent node that processes messages and decides on tool usage."""
-    messages = state["messages"]
-    
-    # Add system message if this is the first interaction
-    if not any(isinstance(msg, SystemMessage) for msg in messages):
-        system_message = SystemMessage(content="""You are an AI assistant that can search through document collections using MCP (Model Context Protocol) endpoints.
+# System prompt for the agent
+SYSTEM_PROMPT = """You are an AI assistant that can search through document collections using MCP (Model Context Protocol) endpoints.
 
 Your capabilities:
 1. Use 'search_collection' to search for documents in the connected collection using natural language queries
-2. You can search multiple times with different queries to find comprehensive information
-3. Always provide helpful summaries of the search results
+2. Search results only include a short snippet of each chunk; use 'get_chunk' with a result's chunk id when you need its full content
+3. You can search multiple times with different queries to find comprehensive information
+4. Always provide helpful summaries of the search results
 
-The collection contains documents that you can search through. Be helpful in formulating good search queries and interpreting the results for the user.""")
-        messages = [system_message] + messages
-    
-    # Get response from LLM
-    response = llm_with_tools.invoke(messages)
-    
-    return {"messages": [response]}
+The collection contains documents that you can search through. Be helpful in formulating good search queries and interpreting the results for the user."""
 
-# Define the tool node
-tool_node = ToolNode(tools)
-
-# Define the conditional edge function
-def should_continue(state: AgentState) -> str:
-    """Determine whether to continue with tool calls or end."""
-    messages = state["messages"]
-    last_message = messages[-1]
-    
-    # If the last message has tool calls, go to tools
-    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-        return "tools"
-    # Otherwise, end
-    return END
+# Define the nodes: the agent, the budgeted tool runner, and the fallback
+# that answers without tools once the per-turn budget is used up
+agent_node = make_agent_node(llm_with_tools, SYSTEM_PROMPT, synthesis_llm=llm if SPLIT_MODEL_TIERS else None)
+tool_node = make_tool_node(tools)
+finalize_node = make_finalize_node(llm, SYSTEM_PROMPT)
 
 # Create the graph
 workflow = StateGraph(AgentState)
@@ -162,6 +273,7 @@ workflow = StateGraph(AgentState)
 # Add nodes
 workflow.add_node("agent", agent_node)
 workflow.add_node("tools", tool_node)
+workflow.add_node("finalize", finalize_node)
 
 # Set entry point
 workflow.set_entry_point("agent")
@@ -172,12 +284,14 @@ workflow.add_conditional_edges(
     should_continue,
     {
         "tools": "tools",
+        "finalize": "finalize",
         END: END
     }
 )
 
 # Add edge from tools back to agent
 workflow.add_edge("tools", "agent")
+workflow.add_edge("finalize", END)
 
 # Compile the graph
 app = workflow.compile()
@@ -188,12 +302,18 @@ async def main():
     print(f"Connected to: \033[33m{MCP_SERVER_URL}\033[0m")
     print("Type \033[33mexit\033[0m or \033[33mquit\033[0m to exit, \033[33mhelp\033[0m for instructions\n")
     
+    reader = AsyncLineReader()
+    
     while True:
         try:
-            user_input = input("\033[1m\033[32mYou:\033[0m ")
+            user_input = await reader.readline("\033[1m\033[32mYou:\033[0m ")
             
             # Handle special commands
             if user_input.lower() in ["exit", "quit", "q"]:
+                if format_loop_metrics():
+                    print(f"\033[90mLoop guard: {format_loop_metrics()}\033[0m")
+                if accounting.format_tiers():
+                    print(f"\033[90mModel tiers: {accounting.format_tiers()}\033[0m")
                 print("Goodbye!")
                 break
             
@@ -201,6 +321,9 @@ async def main():
                 print("\n\033[1mCommands:\033[0m")
                 print("  help, ?       - Show this help message")
                 print("  exit, quit, q - Exit the agent")
+                print("  profile       - Toggle per-turn CPU and allocation profiling")
+                print("  stats         - Show token, request and latency totals for this session")
+                print("  stats > FILE  - Export them, with every turn, as JSON")
                 print("\033[1mCapabilities:\033[0m")
                 print("  - Search documents in the collection")
                 print("  - Ask questions about the content")
@@ -208,6 +331,22 @@ async def main():
                 print("  - Press Ctrl+C at any time to interrupt\n")
                 continue
             
+            if user_input.lower() == "profile":
+                state = "on" if profiler.toggle() else "off"
+                print(f"\033[90mProfiling {state} (reports go to {profiler.directory})\033[0m\n")
+                continue
+            
+            # Only a bare "stats" or "stats > FILE" is a command; questions starting with "stats" go to the agent
+            command, _, path = user_input.partition(">")
+            if command.strip().lower() == "stats":
+                path = path.strip()
+                if path:
+                    accounting.export_json(path)
+                    print(f"\033[90mSession stats written to {path}\033[0m\n")
+                else:
+                    print(f"\033[90m{accounting.format_stats()}\033[0m\n")
+                continue
+            
             if not user_input.strip():
                 continue
             
@@ -218,8 +357,11 @@ async def main():
                 "messages": [HumanMessage(content=user_input)]
             }
             
-            # Run the graph
-            final_state = await app.ainvoke(initial_state)
+            # Run the graph under a per-turn deadline; Ctrl+C cancels only this turn
+            with accounting.turn(user_input), profiler.turn(user_input) as profile:
+                final_state = await run_turn(app.ainvoke(initial_state), TurnDeadline())
+            if profile:
+                print(f"\033[90m📈 Profile written to {profile.report_path}\033[0m")
             
             # Get the final response
             final_message = final_state["messages"][-1]
@@ -228,6 +370,10 @@ async def main():
             else:
                 print(f"\n\033[1m\033[34mMCP Collections Agent:\033[0m {final_message}\n")
             
+        except DeadlineExceeded as e:
+            print(f"\n\033[31m⏱️ {e}\033[0m\n")
+        except TurnCancelled as e:
+            print(f"\n\033[33m{e}\nType 'exit' to quit or continue with a new query.\033[0m")
         except KeyboardInterrupt:
             print("\n\033[33mOperation interrupted. Type 'exit' to quit or continue with a new query.\033[0m")
         except EOFError:
@@ -237,8 +383,20 @@ async def main():
             print(f"\n\033[31mError: {e}\033[0m\n")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LangGraph agent with MCP collections search")
+    parser.add_argument("--profile", action="store_true", help="Write a CPU and allocation profile of every turn to PROFILE_DIR")
+    parser.add_argument("--stats-json", metavar="FILE", help="Write token, request and latency stats to FILE on exit")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable()
+    
     try:
-        asyncio.run(main())
+        # Records or replays HTTP traffic when LAUNCHPAD_CASSETTE is set
+        with cassette_from_env():
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\033[33mExiting...\033[0m")
-        sys.exit(0) 
\ No newline at end of file
+        sys.exit(0) 
+    finally:
+        if args.stats_json:
+            accounting.export_json(args.stats_json)
@@ -0,0 +1,279 @@
+"""Token, backend-call and latency accounting for the LaunchpadAI LangGraph scripts.
+
+Every LLM call made by the agent and finalize nodes records its input, output
+and cached tokens; every tool call records how long it took and how many HTTP
+requests (and bytes) it made; every turn records its wall time. Turns roll up
+into a session summary that the REPL prints with "stats" or exports as JSON,
+showing which tools drive cost and latency.
+
+HTTP requests are counted by wrapping requests.Session.send, which covers the
+requests-based clients; the collections script's curl calls are recorded by
+the script itself. Byte counts are of bodies as the scripts see them, after
+decompression.
+"""
+import contextvars
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+class TurnUsage:
+    """What one turn cost: LLM calls, tool calls and their HTTP traffic."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.time()
+        self.seconds: Optional[float] = None
+        # One entry per LLM call, in call order
+        self.llm_calls: List[Dict[str, Any]] = []
+        # Per tool name; HTTP requests made outside a tool count under "(no tool)"
+        self.tools: Dict[str, Counter] = {}
+
+    def totals(self) -> Dict[str, Any]:
+        """Totals for the turn, as exported with each turn."""
+        return {
+            "seconds": round(self.seconds or 0.0, 3),
+            "llm_calls": len(self.llm_calls),
+            "input_tokens": sum(call["input_tokens"] for call in self.llm_calls),
+            "cached_tokens": sum(call["cached_tokens"] for call in self.llm_calls),
+            "output_tokens": sum(call["output_tokens"] for call in self.llm_calls),
+            "tool_calls": sum(counts["calls"] for counts in self.tools.values()),
+            "http_calls": sum(counts["http_calls"] for counts in self.tools.values()),
+            "bytes_sent": sum(counts["bytes_sent"] for counts in self.tools.values()),
+            "bytes_received": sum(counts["bytes_received"] for counts in self.tools.values()),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "totals": self.totals(),
+            "llm_calls": self.llm_calls,
+            "tools": {name: dict(counts) for name, counts in self.tools.items()},
+        }
+
+current_usage: contextvars.ContextVar[Optional[TurnUsage]] = contextvars.ContextVar(
+    "current_usage", default=None
+)
+# The tool whose HTTP requests are being counted; set by the tool node
+current_tool: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_tool", default=None
+)
+
+class SessionAccounting:
+    """Turn-by-turn usage for one session, plus requests made between turns."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.turns: List[TurnUsage] = []
+        # Warm-up, token refreshes and health probes made outside any turn
+        self.background: Counter = Counter()
+        # Tools run on worker threads, so counters are updated under a lock
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def turn(self, label: str) -> Iterator[TurnUsage]:
+        """Account for one graph turn.
+
+        Start the turn's task inside this block so that the nodes and tools
+        it runs find the turn through the context.
+        """
+        usage = TurnUsage(label)
+        token = current_usage.set(usage)
+        started = time.perf_counter()
+        try:
+            yield usage
+        finally:
+            usage.seconds = time.perf_counter() - started
+            current_usage.reset(token)
+            with self._lock:
+                self.turns.append(usage)
+
+    def _counters(self) -> Counter:
+        """Counters that HTTP requests made right now belong to."""
+        usage = current_usage.get()
+        if usage is None:
+            return self.background
+        name = current_tool.get() or "(no tool)"
+        with self._lock:
+            return usage.tools.setdefault(name, Counter())
+
+    def record_llm_call(self, stage: str, tier: str, response: Any, seconds: float):
+        """Record the token usage reported on an LLM response."""
+        usage = current_usage.get()
+        if usage is None:
+            return
+        metadata = getattr(response, "usage_metadata", None) or {}
+        details = metadata.get("input_token_details") or {}
+        call = {
+            "stage": stage,
+            "tier": tier,
+            "model": (getattr(response, "response_metadata", None) or {}).get("model_name"),
+            "input_tokens": metadata.get("input_tokens", 0),
+            "cached_tokens": details.get("cache_read", 0),
+            "output_tokens": metadata.get("output_tokens", 0),
+            "seconds": round(seconds, 3),
+        }
+        with self._lock:
+            usage.llm_calls.append(call)
+
+    @contextmanager
+    def tool_call(self, name: str) -> Iterator[Dict[str, bool]]:
+        """Time a tool call and attribute the HTTP requests it makes to it.
+
+        Set result["error"] to count the call as failed.
+        """
+        result = {"error": False}
+        token = current_tool.set(name)
+        started = time.perf_counter()
+        try:
+            yield result
+        except BaseException:
+            result["error"] = True
+            raise
+        finally:
+            current_tool.reset(token)
+            usage = current_usage.get()
+            if usage is not None:
+                with self._lock:
+                    counters = usage.tools.setdefault(name, Counter())
+                    counters["calls"] += 1
+                    counters["errors"] += result["error"]
+                    counters["seconds"] += time.perf_counter() - started
+
+    def record_http(self, bytes_sent: int, bytes_received: int = 0) -> Counter:
+        """Count an HTTP request; returns the counters so bytes read later can be added."""
+        counters = self._counters()
+        with self._lock:
+            counters["http_calls"] += 1
+            counters["bytes_sent"] += bytes_sent
+            counters["bytes_received"] += bytes_received
+        return counters
+
+    def add_bytes_received(self, counters: Counter, size: int):
+        with self._lock:
+            counters["bytes_received"] += size
+
+    def summary(self) -> Dict[str, Any]:
+        """Session totals, per model tier and per tool."""
+        with self._lock:
+            turns = list(self.turns)
+        seconds = [turn.seconds or 0.0 for turn in turns]
+        tiers: Dict[str, Counter] = {}
+        tools: Dict[str, Counter] = {}
+        for turn in turns:
+            for call in turn.llm_calls:
+                tier = tiers.setdefault(call["tier"], Counter())
+                tier["calls"] += 1
+                for field in ("input_tokens", "cached_tokens", "output_tokens", "seconds"):
+                    tier[field] += call[field]
+            for name, counts in turn.tools.items():
+                tools.setdefault(name, Counter()).update(counts)
+        return {
+            "started_at": self.started_at,
+            "turns": len(turns),
+            "turn_seconds": {
+                "total": round(sum(seconds), 3),
+                "mean": round(statistics.mean(seconds), 3) if seconds else 0.0,
+                "median": round(statistics.median(seconds), 3) if seconds else 0.0,
+                "max": round(max(seconds), 3) if seconds else 0.0,
+            },
+            "tiers": {name: dict(counts) for name, counts in tiers.items()},
+            # Most expensive tools first
+            "tools": {
+                name: dict(counts)
+                for name, counts in sorted(tools.items(), key=lambda item: item[1]["seconds"], reverse=True)
+            },
+            "background": dict(self.background),
+        }
+
+    def format_stats(self) -> str:
+        """Human-readable session summary for the REPL's stats command."""
+        summary = self.summary()
+        if not summary["turns"]:
+            return "No turns yet."
+        turn_seconds = summary["turn_seconds"]
+        lines = [
+            f"Turns: {summary['turns']}, {turn_seconds['total']:.1f}s in total "
+            f"(mean {turn_seconds['mean']:.1f}s, median {turn_seconds['median']:.1f}s, max {turn_seconds['max']:.1f}s)",
+            "LLM calls:",
+        ]
+        for tier, counts in summary["tiers"].items():
+            lines.append(
+                f"  {tier}: {counts['calls']} calls, {counts['seconds']:.1f}s, {counts['input_tokens']} input "
+                f"({counts['cached_tokens']} cached) / {counts['output_tokens']} output tokens"
+            )
+        if not summary["tiers"]:
+            lines.append("  none")
+        lines.append("Tools:")
+        for name, counts in summary["tools"].items():
+            lines.append(
+                f"  {name}: {counts.get('calls', 0)} calls ({counts.get('errors', 0)} failed), "
+                f"{counts.get('seconds', 0.0):.1f}s, {counts.get('http_calls', 0)} HTTP requests, "
+                f"{_format_bytes(counts.get('bytes_sent', 0))} sent, {_format_bytes(counts.get('bytes_received', 0))} received"
+            )
+        if not summary["tools"]:
+            lines.append("  none")
+        background = summary["background"]
+        if background:
+            lines.append(
+                f"Between turns: {background.get('http_calls', 0)} HTTP requests, "
+                f"{_format_bytes(background.get('bytes_sent', 0))} sent, {_format_bytes(background.get('bytes_received', 0))} received"
+            )
+        return "\n".join(lines)
+
+    def format_tiers(self) -> str:
+        """Calls, average latency and tokens per model tier on one line, or "" before the first call."""
+        return "; ".join(
+            f"{tier}: {counts['calls']} calls, avg {counts['seconds'] / counts['calls']:.2f}s, "
+            f"{counts['input_tokens']} input / {counts['output_tokens']} output tokens"
+            for tier, counts in self.summary()["tiers"].items()
+        )
+
+    def export_json(self, path: str):
+        """Write the session summary and every turn to a JSON file."""
+        with self._lock:
+            turns = [turn.to_dict() for turn in self.turns]
+        with open(path, "w") as f:
+            json.dump({"session": self.summary(), "turns": turns}, f, indent=2)
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+# Shared by the script's REPL, the graph nodes and the HTTP hook below
+accounting = SessionAccounting()
+
+def _count_streamed_body(response: requests.Response, counters: Counter):
+    """Add a streamed body's bytes as the caller reads them."""
+    iter_content = response.iter_content
+
+    def counted_iter_content(*args, **kwargs):
+        for chunk in iter_content(*args, **kwargs):
+            accounting.add_bytes_received(counters, len(chunk))
+            yield chunk
+    response.iter_content = counted_iter_content
+
+_session_send = requests.Session.send
+
+def _counted_send(session: requests.Session, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    body = request.body or b""
+    counters = accounting.record_http(len(body.encode() if isinstance(body, str) else body))
+    response = _session_send(session, request, **kwargs)
+    if kwargs.get("stream"):
+        _count_streamed_body(response, counters)
+    else:
+        accounting.add_bytes_received(counters, len(response.content))
+    return response
+
+# requests.post() and friends go through Session.send as well
+if not getattr(requests.Session.send, "_counted", False):
+    _counted_send._counted = True
+    requests.Session.send = _counted_send
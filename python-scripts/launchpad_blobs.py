@@ -0,0 +1,288 @@
+"""Content-addressed storage for large tool outputs.
+
+Tool results above BLOB_THRESHOLD_BYTES are moved out of the graph state into
+a BlobStore: an in-memory LRU that spills evicted blobs to disk. The
+ToolMessage kept in state holds a short preview plus a reference, and the full
+text is put back only for the latest turns when messages are sent to the LLM,
+so copying or checkpointing the state, and building each prompt, stays cheap
+however long the session runs.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+# Tool outputs larger than this (UTF-8 bytes) are stored as blobs
+BLOB_THRESHOLD_BYTES = int(os.getenv("BLOB_THRESHOLD_BYTES", "4096"))
+# Characters of an offloaded output kept in state as its preview
+BLOB_PREVIEW_CHARS = int(os.getenv("BLOB_PREVIEW_CHARS", "500"))
+# Bytes of blobs kept in memory before the least recently used ones spill to disk
+BLOB_MEMORY_BYTES = int(os.getenv("BLOB_MEMORY_BYTES", str(8 * 1024 * 1024)))
+# Turns, counting back from the latest, whose offloaded tool outputs the LLM sees in full (0: all)
+BLOB_EXPAND_TURNS = int(os.getenv("BLOB_EXPAND_TURNS", "1"))
+BLOB_DIR = os.getenv("BLOB_DIR") or os.path.join(tempfile.gettempdir(), "launchpad-blobs")
+
+class BlobStore:
+    """Blobs keyed by the SHA-256 of their content.
+
+    Storing the same content twice keeps one copy. Blobs live in memory until
+    the memory budget is exceeded, then the least recently used are written to
+    a subdirectory of directory owned by this process and read back from there
+    on demand. close() removes that subdirectory; the shared store does so at
+    exit, and subdirectories of processes that died without closing are
+    removed the next time a store starts spilling.
+    """
+
+    def __init__(self, directory: str = BLOB_DIR, memory_bytes: int = BLOB_MEMORY_BYTES):
+        self.directory = directory
+        # Named after the pid, so stale ones can be told apart from live ones
+        self.spill_directory = os.path.join(directory, f"{os.getpid()}-{id(self):x}")
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"puts": 0, "deduplicated": 0, "spilled": 0, "disk_reads": 0}
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.spill_directory, digest[:2], digest)
+
+    def _spill(self, digest: str, data: bytes):
+        """Write a blob to disk unless it is already there."""
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+        if not os.path.isdir(self.spill_directory):
+            _remove_stale_spills(self.directory)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a crash never leaves a truncated blob behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.stats["spilled"] += 1
+
+    def _remember(self, digest: str, data: bytes):
+        """Keep a blob in memory, spilling the oldest ones past the budget."""
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return
+        self._memory[digest] = data
+        self._memory_used += len(data)
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            old_digest, old_data = self._memory.popitem(last=False)
+            self._memory_used -= len(old_data)
+            self._spill(old_digest, old_data)
+
+    def put(self, text: str) -> str:
+        """Store text and return its digest."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.stats["puts"] += 1
+            if digest in self._memory or os.path.exists(self._path(digest)):
+                self.stats["deduplicated"] += 1
+            self._remember(digest, data)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Text stored under digest; raises KeyError if it is unknown."""
+        with self._lock:
+            data = self._memory.get(digest)
+            if data is None:
+                try:
+                    with open(self._path(digest), "rb") as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    raise KeyError(digest) from None
+                self.stats["disk_reads"] += 1
+            self._remember(digest, data)
+        return data.decode("utf-8")
+
+    def memory_usage(self) -> int:
+        """Bytes of blob data currently held in memory."""
+        return self._memory_used
+
+    def close(self):
+        """Delete this store's spilled blobs; blobs still in memory stay readable."""
+        with self._lock:
+            shutil.rmtree(self.spill_directory, ignore_errors=True)
+
+_SPILL_DIRECTORY_NAME = re.compile(r"(\d+)-[0-9a-f]+")
+
+def _process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running, but owned by another user
+        return True
+    return True
+
+def _remove_stale_spills(directory: str):
+    """Remove spill subdirectories left behind by processes that are no longer running."""
+    # os.kill() with signal 0 terminates the process on Windows instead of probing it
+    if os.name == "nt" or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        match = _SPILL_DIRECTORY_NAME.fullmatch(name)
+        if match and not _process_running(int(match.group(1))):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+# Shared by every graph in the process
+blob_store = BlobStore()
+atexit.register(blob_store.close)
+
+class BlobArtifact(dict):
+    """A dict artifact kept in the blob store and loaded on first access.
+
+    Reading it works like reading the original dict, so code that uses
+    ToolMessage.artifact doesn't need to know it was offloaded. Copies and
+    pickles carry only the digest and load again from the store. Treat it as
+    read-only: changes are lost when the message is copied.
+    """
+
+    def __init__(self, digest: str, store: Optional[BlobStore] = None):
+        super().__init__()
+        self.digest = digest
+        self.store = store
+        self.loaded = False
+
+    def _load(self):
+        if not self.loaded:
+            super().update(json.loads((self.store or blob_store).get(self.digest)))
+            self.loaded = True
+
+    def __getitem__(self, key: Any) -> Any:
+        self._load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key: Any) -> bool:
+        self._load()
+        return super().__contains__(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._load()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._load()
+        return super().__len__()
+
+    def __eq__(self, other: Any) -> bool:
+        self._load()
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        self._load()
+        return super().__repr__()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self._load()
+        return super().get(key, default)
+
+    def keys(self) -> Any:
+        self._load()
+        return super().keys()
+
+    def values(self) -> Any:
+        self._load()
+        return super().values()
+
+    def items(self) -> Any:
+        self._load()
+        return super().items()
+
+    def copy(self) -> Dict[str, Any]:
+        self._load()
+        return dict(super().items())
+
+    def __copy__(self) -> "BlobArtifact":
+        return BlobArtifact(self.digest, self.store)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "BlobArtifact":
+        # The blob is immutable, so a copy can share it
+        return BlobArtifact(self.digest, self.store)
+
+    def __reduce__(self) -> Any:
+        # Pickles load from the blob store of the process that unpickles them
+        return BlobArtifact, (self.digest,)
+
+    __hash__ = None
+
+def _marker(ref: Dict[str, Any]) -> str:
+    return f"\n... [{ref['size']} chars in total, stored as blob {ref['content']}]"
+
+def offload_tool_message(message: ToolMessage, store: Optional[BlobStore] = None) -> ToolMessage:
+    """Replace a large tool output with a preview and a blob reference.
+
+    The reference is kept in additional_kwargs["blob"], so it survives
+    serialization of the state. Large artifacts are stored the same way.
+    """
+    store = store or blob_store
+    content = message.content
+    if not isinstance(content, str) or "blob" in message.additional_kwargs:
+        return message
+
+    artifact = message.artifact
+    artifact_digest = None
+    # Dict artifacts (what the tools return) can be loaded lazily; anything else stays inline
+    if isinstance(artifact, dict) and not isinstance(artifact, BlobArtifact):
+        artifact_json = json.dumps(artifact, default=str)
+        if len(artifact_json.encode("utf-8")) > BLOB_THRESHOLD_BYTES:
+            artifact_digest = store.put(artifact_json)
+            artifact = BlobArtifact(artifact_digest, store)
+
+    if len(content.encode("utf-8")) <= BLOB_THRESHOLD_BYTES and artifact_digest is None:
+        return message
+
+    ref: Dict[str, Any] = {"artifact": artifact_digest}
+    if len(content.encode("utf-8")) > BLOB_THRESHOLD_BYTES:
+        ref.update(content=store.put(content), size=len(content))
+        content = content[:BLOB_PREVIEW_CHARS] + _marker(ref)
+
+    return message.model_copy(update={
+        "content": content,
+        "artifact": artifact,
+        "additional_kwargs": {**message.additional_kwargs, "blob": ref},
+    })
+
+def resolve_content(message: ToolMessage, store: Optional[BlobStore] = None) -> str:
+    """Full text of a tool message, loading it from the blob store if it was offloaded."""
+    ref = message.additional_kwargs.get("blob")
+    if not ref or "content" not in ref:
+        return message.content
+    # Anything appended after the preview (e.g. a repeated-call note) is kept
+    _, found, suffix = message.content.partition(_marker(ref))
+    return (store or blob_store).get(ref["content"]) + (suffix if found else "")
+
+def resolve_artifact(message: ToolMessage, store: Optional[BlobStore] = None) -> Any:
+    """Full artifact of a tool message as a plain object, loading it from the blob store if it was offloaded."""
+    artifact = message.artifact
+    return artifact.copy() if isinstance(artifact, BlobArtifact) else artifact
+
+def resolve_messages(messages: Sequence[Any], store: Optional[BlobStore] = None,
+                     turns: int = BLOB_EXPAND_TURNS) -> List[Any]:
+    """Copy of messages for sending to the LLM, with the latest turns' offloaded tool outputs expanded.
+
+    Tool outputs from earlier turns keep their preview and blob marker, so
+    building a prompt reads only the blobs the current work needs instead of
+    the whole history.
+    """
+    # Expand from the turns-th latest user message on; everything when there are fewer turns
+    user_indexes = [i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage)]
+    expand_from = user_indexes[-turns] if 0 < turns <= len(user_indexes) else 0
+    resolved = list(messages[:expand_from])
+    for msg in messages[expand_from:]:
+        if isinstance(msg, ToolMessage) and msg.additional_kwargs.get("blob", {}).get("content"):
+            msg = msg.model_copy(update={"content": resolve_content(msg, store)})
+        resolved.append(msg)
+    return resolved
@@ -0,0 +1,50 @@
+"""Key/value cache with expiry that several processes can share.
+
+Backed by a single SQLite file, so worker processes of launchpad_engine.py can
+reuse one A2A access token and each other's search results instead of every
+worker repeating the same backend round trips.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+class SharedCache:
+    """JSON values stored under string keys, each with its own time to live."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections can't cross threads or forked processes, so each gets its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Value stored under key, or None if it is missing or expired."""
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a JSON-serializable value under key for ttl seconds."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl)
+        )
+
+    def purge(self):
+        """Drop expired entries."""
+        self._connection().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
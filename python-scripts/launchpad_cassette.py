@@ -0,0 +1,278 @@
+"""Record and replay the scripts' HTTP traffic.
+
+A Cassette captures every request the scripts make (requests-based clients
+and the curl calls of the collections script), with the response and how long
+it took, to a JSON file. In replay mode the same responses are served back from
+the file after the original latency multiplied by latency_scale (0 serves them
+instantly), so parsing and formatting can be benchmarked without a live,
+nondeterministic backend.
+
+Secrets are redacted before anything is written: API keys, bearer tokens and
+client secrets never reach the cassette file.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import launchpad_deadline
+
+REDACTED = "REDACTED"
+SECRET_HEADERS = {"authorization", "x-api-key", "cookie", "set-cookie"}
+SECRET_FIELDS = {"client_secret", "access_token", "refresh_token", "code", "api_key"}
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request has no recorded counterpart."""
+
+def _redact_json(text: str) -> str:
+    """Blank out secret fields of a JSON object; anything else is returned unchanged."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return text
+    if not isinstance(data, dict) or not SECRET_FIELDS & data.keys():
+        return text
+    return json.dumps({key: REDACTED if key in SECRET_FIELDS else value for key, value in data.items()})
+
+def _normalize_body(text: str) -> str:
+    """Redacted body with JSON keys sorted, for matching.
+
+    JSON-RPC ids are left out: they count up per session, so they differ
+    between the recording and every replay.
+    """
+    redacted = _redact_json(text)
+    try:
+        data = json.loads(redacted)
+    except (TypeError, ValueError):
+        return redacted
+    if isinstance(data, dict) and "jsonrpc" in data:
+        data.pop("id", None)
+    return json.dumps(data, sort_keys=True)
+
+def _with_jsonrpc_id(body: str, request_id: Any) -> str:
+    """Recorded JSON-RPC response (plain JSON or SSE) re-addressed to request_id."""
+    def readdress(text: str) -> str:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return text
+        if isinstance(data, dict) and "id" in data:
+            data["id"] = request_id
+            return json.dumps(data)
+        return text
+
+    if not body.lstrip().startswith(("event:", "data:", "id:", ":")):
+        return readdress(body)
+    lines = []
+    for line in body.split("\n"):
+        if line.startswith("data:"):
+            line = "data: " + readdress(line[len("data:"):].strip())
+        lines.append(line)
+    return "\n".join(lines)
+
+def _redact_command(cmd: Sequence[str]) -> List[str]:
+    redacted = []
+    for arg in cmd:
+        name, sep, _ = arg.partition(":")
+        if sep and name.strip().lower() in SECRET_HEADERS:
+            arg = f"{name}: {REDACTED}"
+        redacted.append(arg)
+    # The request body follows -d
+    for i, arg in enumerate(redacted[:-1]):
+        if arg == "-d":
+            redacted[i + 1] = _normalize_body(redacted[i + 1])
+    return redacted
+
+def _request_key(method: str, url: str, body: str) -> str:
+    # Only the path counts, so a cassette recorded against one host replays against any other
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return f"{method} {path} {_normalize_body(body)}"
+
+def _command_key(cmd: Sequence[str]) -> str:
+    # Drop the URL's host for the same reason
+    return json.dumps([urlsplit(arg).path if arg.startswith(("http://", "https://")) else arg for arg in _redact_command(cmd)])
+
+class Cassette:
+    """Recorded request/response pairs, used as a context manager.
+
+    mode is "record" (forward requests and save what comes back) or "replay"
+    (answer from the file). In replay, requests are matched by method, path and
+    body; when a body never matches exactly (e.g. it contains a timestamp), the
+    next recording for the same method and path is used. Recordings are reused
+    round-robin once exhausted, so benchmarks can repeat a call many times.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0,
+                 metadata: Dict[str, Any] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.interactions: List[Dict[str, Any]] = []
+        # Saved with the recording, e.g. the agent ids its request paths contain
+        self.metadata = metadata or {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._patches: List[Tuple[Any, str, Any]] = []
+        if mode == "replay":
+            with open(path) as f:
+                data = json.load(f)
+            self.interactions = data["interactions"]
+            self.metadata = data.get("metadata", {})
+
+    # Matching
+
+    def _find(self, kind: str, key: str, fallback_key: str) -> Dict[str, Any]:
+        with self._lock:
+            for match_key, field in ((key, "key"), (fallback_key, "fallback_key")):
+                candidates = [i for i in self.interactions if i["kind"] == kind and i[field] == match_key]
+                if candidates:
+                    position = self._positions.get(match_key, 0)
+                    self._positions[match_key] = position + 1
+                    return candidates[position % len(candidates)]
+        raise CassetteMiss(f"No recorded {kind} for {key}")
+
+    def _wait(self, interaction: Dict[str, Any]):
+        if self.latency_scale:
+            time.sleep(interaction["elapsed"] * self.latency_scale)
+
+    # requests
+
+    def _send(self, original_send: Any, adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        body = request.body.decode() if isinstance(request.body, bytes) else (request.body or "")
+        key = _request_key(request.method, request.url, body)
+        fallback_key = _request_key(request.method, request.url, "")
+
+        if self.mode == "replay":
+            interaction = self._find("http", key, fallback_key)
+            self._wait(interaction)
+            response_body = interaction["response"]["body"]
+            try:
+                request_id = json.loads(body).get("id")
+            except (ValueError, AttributeError):
+                request_id = None
+            if request_id is not None:
+                response_body = _with_jsonrpc_id(response_body, request_id)
+            response = requests.Response()
+            response.status_code = interaction["response"]["status"]
+            response.headers = CaseInsensitiveDict(interaction["response"]["headers"])
+            response._content = response_body.encode()
+            response._content_consumed = True
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+
+        started = time.perf_counter()
+        response = original_send(adapter, request, **kwargs)
+        # Reading the body here keeps streamed (SSE) responses readable afterwards
+        content = response.content
+        elapsed = time.perf_counter() - started
+        self._append({
+            "kind": "http",
+            "key": key,
+            "fallback_key": fallback_key,
+            "elapsed": elapsed,
+            "request": {"method": request.method, "path": urlsplit(request.url).path, "body": _redact_json(body)},
+            "response": {
+                "status": response.status_code,
+                "headers": {
+                    name: REDACTED if name.lower() in SECRET_HEADERS else value
+                    for name, value in response.headers.items()
+                    if name.lower() not in ("content-encoding", "content-length", "transfer-encoding", "date", "server")
+                },
+                "body": _redact_json(content.decode("utf-8", errors="replace")),
+            },
+        })
+        return response
+
+    # curl (run_command)
+
+    def _run_command(self, original_run: Any, cmd: Sequence[str], stage: str) -> subprocess.CompletedProcess:
+        key = _command_key(cmd)
+        fallback_key = _command_key([arg for arg in cmd if not arg.startswith("{")])
+        if self.mode == "replay":
+            interaction = self._find("command", key, fallback_key)
+            with launchpad_deadline.get_deadline().stage(stage):
+                self._wait(interaction)
+            return subprocess.CompletedProcess(list(cmd), interaction["returncode"], interaction["stdout"], interaction["stderr"])
+
+        started = time.perf_counter()
+        result = original_run(cmd, stage)
+        self._append({
+            "kind": "command",
+            "key": key,
+            "fallback_key": fallback_key,
+            "elapsed": time.perf_counter() - started,
+            "command": _redact_command(cmd),
+            "returncode": result.returncode,
+            "stdout": _redact_json(result.stdout),
+            "stderr": result.stderr,
+        })
+        return result
+
+    def _append(self, interaction: Dict[str, Any]):
+        with self._lock:
+            self.interactions.append(interaction)
+
+    # Installation
+
+    def _patch(self, target: Any, name: str, replacement: Any):
+        self._patches.append((target, name, getattr(target, name)))
+        setattr(target, name, replacement)
+
+    def __enter__(self) -> "Cassette":
+        cassette = self
+        original_send = HTTPAdapter.send
+
+        def send(adapter, request, **kwargs):
+            return cassette._send(original_send, adapter, request, **kwargs)
+        self._patch(HTTPAdapter, "send", send)
+
+        # Modules did "from launchpad_deadline import run_command", so patch every copy
+        original_run = launchpad_deadline.run_command
+
+        def run_command(cmd, stage):
+            return cassette._run_command(original_run, cmd, stage)
+        for module in list(sys.modules.values()):
+            if getattr(module, "run_command", None) is original_run:
+                self._patch(module, "run_command", run_command)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._patches:
+            target, name, original = self._patches.pop()
+            setattr(target, name, original)
+        if self.mode == "record":
+            self.save()
+
+    def save(self):
+        """Write the recorded interactions to the cassette file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"version": 1, "metadata": self.metadata, "interactions": self.interactions}, f, indent=2)
+
+def cassette_from_env() -> Any:
+    """Cassette configured by LAUNCHPAD_CASSETTE, or a no-op context manager.
+
+    LAUNCHPAD_CASSETTE_MODE is "record" or "replay" (default), and
+    LAUNCHPAD_REPLAY_LATENCY_SCALE scales recorded latencies in replay.
+    """
+    path = os.getenv("LAUNCHPAD_CASSETTE")
+    if not path:
+        return nullcontext()
+    mode = os.getenv("LAUNCHPAD_CASSETTE_MODE", "replay")
+    scale = float(os.getenv("LAUNCHPAD_REPLAY_LATENCY_SCALE", "1.0"))
+    print(f"\033[90m{'Recording to' if mode == 'record' else 'Replaying'} cassette {path}\033[0m")
+    return Cassette(path, mode, scale)
@@ -0,0 +1,215 @@
+"""Per-turn deadlines and cancellation for the LaunchpadAI LangGraph scripts.
+
+Every graph run gets a TurnDeadline that is published through a context
+variable. Agent nodes, tools and HTTP helpers size their timeouts from the time
+left in the turn, record how long each stage took, and stop as soon as the
+deadline passes or the user presses Ctrl+C.
+"""
+import asyncio
+import contextvars
+import os
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Wall-clock budget for one user turn, including every LLM and backend call
+TURN_DEADLINE_SECONDS = float(os.getenv("TURN_DEADLINE_SECONDS", "120"))
+
+class DeadlineExceeded(Exception):
+    """Raised when a turn runs out of time."""
+
+    def __init__(self, stage: str, deadline: "TurnDeadline"):
+        self.stage = stage
+        self.deadline = deadline
+        super().__init__(
+            f"Turn deadline of {deadline.budget:.0f}s exceeded during {stage}. "
+            f"Time spent: {deadline.summary()}"
+        )
+
+class TurnCancelled(Exception):
+    """Raised when the user interrupts a running turn."""
+
+    def __init__(self, stage: str, deadline: "TurnDeadline"):
+        self.stage = stage
+        self.deadline = deadline
+        super().__init__(f"Turn cancelled during {stage}. Time spent: {deadline.summary()}")
+
+class TurnDeadline:
+    """Time budget for a single graph run.
+
+    Stages are timed with the stage() context manager so that, when the budget
+    runs out, the error can say where the time went.
+    """
+
+    def __init__(self, budget: float = TURN_DEADLINE_SECONDS):
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget
+        self.stages: List[Tuple[str, float]] = []
+        self.active_stages: List[Tuple[str, float]] = []
+        self.cancelled = threading.Event()
+        self.exceeded_stage: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """Raise if the turn was cancelled or has run out of time."""
+        if self.cancelled.is_set():
+            raise TurnCancelled(stage, self)
+        if self.expired():
+            # Remember the first stage to hit the deadline; later checks only see the fallout
+            self.exceeded_stage = self.exceeded_stage or stage
+            raise DeadlineExceeded(stage, self)
+
+    def timeout(self, stage: str) -> float:
+        """Timeout to pass to a blocking call made during stage."""
+        self.check(stage)
+        return self.remaining()
+
+    def cancel(self):
+        """Ask in-flight work for this turn to stop."""
+        self.cancelled.set()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage of the turn, e.g. an LLM call or a backend request."""
+        self.check(name)
+        entry = (name, time.monotonic())
+        with self._lock:
+            self.active_stages.append(entry)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active_stages.remove(entry)
+                self.stages.append((name, time.monotonic() - entry[1]))
+
+    def current_stage(self) -> str:
+        """Most recently started stage that is still running."""
+        with self._lock:
+            return self.active_stages[-1][0] if self.active_stages else "graph run"
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds spent per stage name, largest first."""
+        now = time.monotonic()
+        totals: Dict[str, float] = {}
+        with self._lock:
+            running = [(name, now - started) for name, started in self.active_stages]
+            for name, elapsed in self.stages + running:
+                totals[name] = totals.get(name, 0.0) + elapsed
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def summary(self) -> str:
+        """One-line breakdown of where the turn's time went."""
+        elapsed = time.monotonic() - self.started_at
+        parts = [f"{name} {seconds:.1f}s" for name, seconds in self.totals().items()]
+        return f"{elapsed:.1f}s total" + (f" ({', '.join(parts)})" if parts else "")
+
+current_deadline: contextvars.ContextVar[Optional[TurnDeadline]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+def get_deadline() -> TurnDeadline:
+    """The deadline of the running turn.
+
+    Code running outside a turn (direct tool calls, background tasks) gets a
+    fresh deadline with the default budget, so calls are still bounded.
+    """
+    deadline = current_deadline.get()
+    return deadline if deadline is not None else TurnDeadline()
+
+def request_timeout(stage: str) -> float:
+    """Timeout for an HTTP request made during stage of the current turn."""
+    return get_deadline().timeout(stage)
+
+async def within_deadline(awaitable: Awaitable[Any], stage: str) -> Any:
+    """Await something as a timed stage, raising DeadlineExceeded if it overruns."""
+    deadline = get_deadline()
+    with deadline.stage(stage):
+        try:
+            return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            deadline.exceeded_stage = deadline.exceeded_stage or stage
+            raise DeadlineExceeded(stage, deadline)
+
+def run_command(cmd: Sequence[str], stage: str) -> subprocess.CompletedProcess:
+    """subprocess.run() that is killed when the turn's deadline passes or it is cancelled."""
+    deadline = get_deadline()
+    with deadline.stage(stage):
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        while True:
+            try:
+                # Wake up regularly to notice a Ctrl+C cancellation
+                stdout, stderr = process.communicate(timeout=min(0.25, max(deadline.remaining(), 0.01)))
+                return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+            except subprocess.TimeoutExpired:
+                if deadline.cancelled.is_set() or deadline.expired():
+                    process.kill()
+                    process.communicate()
+                    deadline.check(stage)
+
+async def run_turn(coro: Awaitable[Any], deadline: TurnDeadline, handle_interrupt: bool = True) -> Any:
+    """Run one graph turn under deadline.
+
+    Ctrl+C cancels only the running turn (raising TurnCancelled) instead of
+    leaving it running while the prompt comes back. When the deadline passes
+    the turn is cancelled and DeadlineExceeded names the stage that was running.
+    Pass handle_interrupt=False when turns run concurrently: the SIGINT handler
+    is per process, so overlapping turns would replace each other's.
+    """
+    token = current_deadline.set(deadline)
+    try:
+        # The task copies the current context, so everything it runs sees the deadline
+        task = asyncio.ensure_future(coro)
+    finally:
+        current_deadline.reset(token)
+
+    loop = asyncio.get_running_loop()
+    interrupted_stage: Optional[str] = None
+
+    def on_interrupt():
+        nonlocal interrupted_stage
+        interrupted_stage = deadline.current_stage()
+        deadline.cancel()
+        task.cancel()
+
+    previous_handler = signal.getsignal(signal.SIGINT)
+    handler_installed = False
+    if handle_interrupt:
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_interrupt)
+            handler_installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows event loops and non-main threads can't install signal handlers
+            pass
+
+    try:
+        done, _ = await asyncio.wait({task}, timeout=deadline.remaining())
+        if not done:
+            # Note the running stage before cancellation unwinds it
+            stage = deadline.exceeded_stage or deadline.current_stage()
+            deadline.cancel()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise DeadlineExceeded(stage, deadline)
+        if task.cancelled() and interrupted_stage is not None:
+            raise TurnCancelled(interrupted_stage, deadline)
+        return task.result()
+    except asyncio.CancelledError:
+        deadline.cancel()
+        task.cancel()
+        raise
+    finally:
+        if handler_installed:
+            loop.remove_signal_handler(signal.SIGINT)
+            signal.signal(signal.SIGINT, previous_handler)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Run many prompts through one of the LangGraph scripts.
+
+Turns spend nearly all their time waiting on LLM and backend calls, so each
+worker process runs many sessions at once on its event loop (--concurrency),
+and processes are only there to spread the CPU-bound part (graph bookkeeping,
+JSON, prompt building) over the cores. Each worker imports the script once and
+keeps its compiled graph (and MCP session, HTTP connections, blob store) warm
+for every session it runs. Workers share the A2A access token and search
+results through a SQLite cache, and results are streamed back in submission
+order or as sessions complete.
+
+Usage:
+    python python-scripts/launchpad_engine.py collections prompts.jsonl --workers 4 --concurrency 32 > results.jsonl
+
+Each input line is either plain text (a single-turn session) or a JSON object
+{"session": "<id>", "prompt": "<text>"}; lines with the same session run in
+order, in one worker, with the conversation carried from turn to turn.
+"""
+import argparse
+import asyncio
+import atexit
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from launchpad_cache import SharedCache
+
+SCRIPTS = {
+    "mcp-agent": "langgraph_mcp_agent",
+    "collections": "langgraph_mcp_collections",
+    "a2a": "langgraph_a2a_agent",
+}
+ENGINE_CACHE_PATH = os.getenv("ENGINE_CACHE_PATH") or os.path.join(tempfile.gettempdir(), "launchpad-engine-cache.sqlite")
+# Sessions each worker runs at once
+ENGINE_CONCURRENCY = int(os.getenv("ENGINE_CONCURRENCY", "16"))
+
+# Per-worker state, set up once by _init_worker
+_worker: Dict[str, Any] = {}
+
+def _init_worker(module_name: str, cache_path: str, concurrency: int, profile: bool = False):
+    """Import the script and build its graph once per worker process."""
+    # Tool logging goes to stderr so stdout carries only results
+    sys.stdout = sys.stderr
+    module = importlib.import_module(module_name)
+    if profile:
+        from launchpad_profile import profiler
+        profiler.enable()
+    cache = SharedCache(cache_path)
+    if hasattr(module, "search_cache"):
+        module.search_cache = cache
+    if hasattr(module, "a2a_client"):
+        module.a2a_client.token_cache = cache
+
+    # One loop per worker, so async clients keep their connections between sessions
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    # Sync tools run on the loop's default executor; size it so it doesn't cap concurrency
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2 * concurrency, thread_name_prefix="tools"))
+    _worker.update(module=module, loop=loop, semaphore=asyncio.Semaphore(concurrency))
+    # Spawned workers exit through sys.exit(), so atexit handlers run
+    atexit.register(_close_worker)
+
+def _close_worker():
+    """Close the script's MCP session and the worker's event loop."""
+    module, loop = _worker.get("module"), _worker.get("loop")
+    if hasattr(module, "mcp_session"):
+        module.mcp_session.close()
+    if loop is not None and not loop.is_closed():
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+async def _run_session(session_id: str, prompts: List[str]) -> Dict[str, Any]:
+    """Run the turns of one session in this worker."""
+    from langchain_core.messages import HumanMessage
+    from launchpad_accounting import accounting
+    from launchpad_deadline import DeadlineExceeded, TurnCancelled, TurnDeadline, run_turn
+    from launchpad_profile import profiler
+
+    module = _worker["module"]
+    history: List[Any] = []
+    turns = []
+    async with _worker["semaphore"]:
+        for prompt in prompts:
+            started = time.perf_counter()
+            answer, error, usage = None, None, None
+            try:
+                state = {"messages": history + [HumanMessage(content=prompt)]}
+                # Each session runs in its own task, so the accounting and profiling context is per session
+                with accounting.turn(prompt) as usage, profiler.turn(f"{session_id} {prompt}"):
+                    final_state = await run_turn(module.app.ainvoke(state), TurnDeadline(), handle_interrupt=False)
+                history = final_state["messages"]
+                answer = history[-1].content
+            except (DeadlineExceeded, TurnCancelled) as e:
+                error = str(e)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            turns.append({
+                "prompt": prompt,
+                "answer": answer,
+                "error": error,
+                "seconds": round(time.perf_counter() - started, 3),
+                # Tokens, tool calls and HTTP traffic of the turn
+                "usage": usage.totals() if usage else None,
+            })
+    return {"session": session_id, "worker": os.getpid(), "turns": turns}
+
+def _run_batch(batch: List[Tuple[str, List[str]]]) -> List[Dict[str, Any]]:
+    """Run a batch of sessions concurrently in this worker; results in batch order."""
+    async def run_all() -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(_run_session(session_id, prompts) for session_id, prompts in batch))
+    return _worker["loop"].run_until_complete(run_all())
+
+class ProcessEngine:
+    """Pool of worker processes, each running many sessions at once on a warm graph of one script."""
+
+    def __init__(self, script: str, workers: Optional[int] = None, cache_path: str = ENGINE_CACHE_PATH,
+                 profile: bool = False, concurrency: int = ENGINE_CONCURRENCY):
+        self.module_name = SCRIPTS.get(script, script)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.profile = profile
+        # cProfile can only follow one turn at a time per process
+        self.concurrency = 1 if profile else max(1, concurrency)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ProcessEngine":
+        SharedCache(self.cache_path).purge()
+        # spawn: workers start clean instead of inheriting the parent's threads and sockets
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.module_name, self.cache_path, self.concurrency, self.profile)
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def batch_size(self, session_count: int) -> int:
+        """Sessions per batch: enough to keep a worker's concurrency busy, few enough to use every worker."""
+        return max(1, min(4 * self.concurrency, math.ceil(session_count / self.workers)))
+
+    def run(self, sessions: Iterable[Tuple[str, List[str]]], ordered: bool = True) -> Iterator[Dict[str, Any]]:
+        """Run sessions and yield their results in submission order, or as they complete.
+
+        Sessions go to the workers in batches; with ordered=False a batch's
+        results are yielded together once its slowest session finishes.
+        """
+        sessions = list(sessions)
+        size = self.batch_size(len(sessions))
+        futures = [
+            self.executor.submit(_run_batch, sessions[start:start + size])
+            for start in range(0, len(sessions), size)
+        ]
+        for future in (futures if ordered else as_completed(futures)):
+            yield from future.result()
+
+def read_sessions(lines: Iterable[str]) -> List[Tuple[str, List[str]]]:
+    """Group input lines into sessions, keeping the order sessions first appear in."""
+    sessions: Dict[str, List[str]] = {}
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {number}: invalid JSON ({e})") from None
+            if not isinstance(item, dict) or not isinstance(item.get("prompt"), str):
+                raise ValueError(f'Line {number}: JSON input needs a "prompt" string, e.g. {{"session": "1", "prompt": "..."}}')
+            session_id, prompt = str(item.get("session", number)), item["prompt"]
+        else:
+            session_id, prompt = str(number), line
+        sessions.setdefault(session_id, []).append(prompt)
+    return list(sessions.items())
+
+def main():
+    parser = argparse.ArgumentParser(description="Run prompts through a LangGraph script on a process pool.")
+    parser.add_argument("script", help=f"One of {', '.join(SCRIPTS)} or a module name")
+    parser.add_argument("input", help="Prompt file (plain text or JSONL), - for stdin")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=ENGINE_CONCURRENCY,
+                        help=f"Sessions each worker runs at once (default: {ENGINE_CONCURRENCY}; 1 with --profile)")
+    parser.add_argument("--as-completed", action="store_true", help="Emit sessions as they finish instead of in input order")
+    parser.add_argument("--profile", action="store_true", help="Write a CPU and allocation profile of every turn to PROFILE_DIR")
+    args = parser.parse_args()
+
+    try:
+        if args.input == "-":
+            sessions = read_sessions(sys.stdin)
+        else:
+            with open(args.input) as f:
+                sessions = read_sessions(f)
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    turn_count = error_count = 0
+    with ProcessEngine(args.script, args.workers, profile=args.profile, concurrency=args.concurrency) as engine:
+        for result in engine.run(sessions, ordered=not args.as_completed):
+            turn_count += len(result["turns"])
+            error_count += sum(1 for turn in result["turns"] if turn["error"])
+            print(json.dumps(result), flush=True)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(sessions)} sessions, {turn_count} turns, {error_count} errors in {elapsed:.1f}s "
+        f"({turn_count / elapsed if elapsed else 0:.1f} turns/s, {engine.workers} workers x {engine.concurrency} sessions)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Shared agent, tool and finalize nodes for the LaunchpadAI LangGraph scripts.
+
+Every script wires the same agent -> tools -> agent cycle. The nodes here add a
+per-turn step and tool-call budget to that cycle: identical repeated tool calls
+are answered from the earlier result instead of hitting the backend again, a
+call that keeps repeating ends the loop, and when the budget runs out the
+finalize node asks the model for a best-effort answer without tools. Large
+tool outputs are kept in state as blob references (see launchpad_blobs.py)
+and expanded only in the prompts sent to the LLM.
+
+Models are split into two tiers: a fast, temperature-0 router bound to the
+tools decides which tools to call, and the synthesis model writes the
+answers. Latency and token use are accounted per tier (see launchpad_accounting.py).
+"""
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph import END
+
+from launchpad_accounting import accounting
+from launchpad_blobs import offload_tool_message, resolve_messages
+from launchpad_deadline import DeadlineExceeded, TurnCancelled, within_deadline
+from launchpad_profile import profile_stage
+
+# Per-turn limits on the agent <-> tools cycle
+MAX_AGENT_STEPS = int(os.getenv("MAX_AGENT_STEPS", "8"))
+MAX_TOOL_CALLS = int(os.getenv("MAX_TOOL_CALLS", "12"))
+# How many times an identical call is answered from its earlier result before the loop is stopped
+MAX_REPEATED_CALLS = int(os.getenv("MAX_REPEATED_CALLS", "1"))
+
+# Model tiers. The scripts build their LLMs from these; with identical settings
+# there is a single tier and the router's answer is used as is
+ROUTER_MODEL = os.getenv("ROUTER_MODEL", "gpt-4o-mini")
+ROUTER_TEMPERATURE = float(os.getenv("ROUTER_TEMPERATURE", "0"))
+SYNTHESIS_MODEL = os.getenv("SYNTHESIS_MODEL", "gpt-4o-mini")
+SYNTHESIS_TEMPERATURE = float(os.getenv("SYNTHESIS_TEMPERATURE", "0.7"))
+SPLIT_MODEL_TIERS = (ROUTER_MODEL, ROUTER_TEMPERATURE) != (SYNTHESIS_MODEL, SYNTHESIS_TEMPERATURE)
+
+# Appended to the router's prompt so that, when no tool is needed, it hands over
+# to the synthesis model after a single token instead of drafting an answer
+ROUTER_INSTRUCTION = (
+    "Decide whether more tool calls are needed. If they are, call the tools. "
+    "If not, reply with only the word DONE; another model will write the answer."
+)
+
+# Session-wide counters of LLM and tool round trips the budget saved or cut short
+loop_metrics: Counter = Counter()
+
+def _call_key(call: Dict[str, Any]) -> str:
+    """Identity of a tool call: same tool with the same arguments."""
+    return json.dumps({"name": call["name"], "args": call.get("args", {})}, sort_keys=True)
+
+def _turn_messages(messages: Sequence[Any]) -> List[Any]:
+    """Messages produced since the user's latest input."""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return list(messages[index:])
+    return list(messages)
+
+def _budget_exceeded(messages: Sequence[Any]) -> Optional[str]:
+    """Why the turn should stop calling tools, or None if it can go on."""
+    turn = _turn_messages(messages)
+    agent_steps = [msg for msg in turn if isinstance(msg, AIMessage)]
+    calls = [call for msg in agent_steps for call in msg.tool_calls]
+    if len(agent_steps) >= MAX_AGENT_STEPS:
+        return f"step budget of {MAX_AGENT_STEPS} agent steps used up"
+    if len(calls) > MAX_TOOL_CALLS:
+        return f"tool budget of {MAX_TOOL_CALLS} calls used up"
+
+    # Count agent steps that asked for each call; duplicates within one step run once anyway
+    occurrences = Counter(
+        key for msg in agent_steps for key in {_call_key(call) for call in msg.tool_calls}
+    )
+    for call in agent_steps[-1].tool_calls:
+        if occurrences[_call_key(call)] > 1 + MAX_REPEATED_CALLS:
+            return f"'{call['name']}' was called repeatedly with the same arguments"
+    return None
+
+def tool_error(message: str) -> Tuple[str, Dict[str, Any]]:
+    """Result for a content_and_artifact tool that failed.
+
+    The model sees the message; code reading ToolMessage.artifact gets it
+    under "error" instead of having to recognise error strings.
+    """
+    return message, {"error": message}
+
+def should_continue(state: Dict[str, Any]) -> str:
+    """Determine whether to continue with tool calls, wrap up, or end."""
+    messages = state["messages"]
+    last_message = messages[-1]
+
+    # If the last message has no tool calls, we're done
+    if not (hasattr(last_message, "tool_calls") and last_message.tool_calls):
+        return END
+    # Out of budget or stuck in a loop: answer with what we have
+    if _budget_exceeded(messages):
+        return "finalize"
+    return "tools"
+
+def _with_system_prompt(messages: Sequence[Any], system_prompt: str) -> List[Any]:
+    """Prepend the system prompt unless the conversation already has one.
+
+    Offloaded tool outputs are expanded, since the result goes to the LLM.
+    """
+    messages = resolve_messages(messages)
+    if any(isinstance(msg, SystemMessage) for msg in messages):
+        return messages
+    return [SystemMessage(content=system_prompt)] + messages
+
+async def _invoke_tier(tier: str, llm: Any, messages: Sequence[Any], stage: str) -> Any:
+    """Call a model tier, bounded by the time left in the turn, and account for its tokens and latency."""
+    started = time.perf_counter()
+    response = await within_deadline(llm.ainvoke(messages), stage)
+    accounting.record_llm_call(stage, tier, response, time.perf_counter() - started)
+    return response
+
+def make_agent_node(llm_with_tools: Any, system_prompt: str, synthesis_llm: Optional[Any] = None) -> Callable:
+    """Create the agent node that processes messages and decides on tool usage.
+
+    llm_with_tools is the router tier. When synthesis_llm is given, the router
+    only picks tools and synthesis_llm writes the answer once no more tools
+    are needed; otherwise the router's own answer ends the turn.
+    """
+    async def agent_node(state: Dict[str, Any]) -> Dict[str, Any]:
+        """The main agent node that processes messages and decides on tool usage."""
+        messages = _with_system_prompt(state["messages"], system_prompt)
+
+        with profile_stage("agent"):
+            if synthesis_llm is None:
+                return {"messages": [await _invoke_tier("router", llm_with_tools, messages, "agent")]}
+
+            routing = await _invoke_tier("router", llm_with_tools, messages + [SystemMessage(content=ROUTER_INSTRUCTION)], "agent")
+            if routing.tool_calls:
+                return {"messages": [routing]}
+            # The routing reply is dropped; the answer comes from the synthesis tier
+            response = await _invoke_tier("synthesis", synthesis_llm, messages, "synthesis")
+
+        return {"messages": [response]}
+
+    return agent_node
+
+def make_tool_node(tools: Sequence[Any]) -> Callable:
+    """Create the node that runs the tool calls requested by the agent.
+
+    A call identical to one made earlier in the turn is answered with the
+    earlier result, so an LLM retrying after an error string doesn't cost
+    another backend round trip. Identical calls within one batch run once.
+    """
+    tools_by_name = {t.name: t for t in tools}
+
+    async def tool_node(state: Dict[str, Any]) -> Dict[str, Any]:
+        turn = _turn_messages(state["messages"])
+        last_message = turn[-1]
+
+        # Earlier results in this turn, keyed by the call that produced them
+        calls_by_id = {
+            call["id"]: call
+            for msg in turn[:-1] if isinstance(msg, AIMessage)
+            for call in msg.tool_calls
+        }
+        previous_results: Dict[str, ToolMessage] = {}
+        for msg in turn:
+            if isinstance(msg, ToolMessage) and msg.tool_call_id in calls_by_id:
+                # Keep the original result, not an earlier repeat of it
+                previous_results.setdefault(_call_key(calls_by_id[msg.tool_call_id]), msg)
+
+        async def run_tool(call: Dict[str, Any]) -> ToolMessage:
+            # Time the call and count its HTTP requests toward the tool
+            with accounting.tool_call(call["name"]) as outcome:
+                result = await invoke_tool(call)
+                outcome["error"] = result.status == "error"
+            return result
+
+        async def invoke_tool(call: Dict[str, Any]) -> ToolMessage:
+            tool = tools_by_name.get(call["name"])
+            if tool is None:
+                return ToolMessage(
+                    content=f"Error: unknown tool '{call['name']}'",
+                    tool_call_id=call["id"], name=call["name"], status="error"
+                )
+            try:
+                # Invoking with the tool call itself makes the tool return a ToolMessage
+                result = await tool.ainvoke({**call, "type": "tool_call"})
+            except (DeadlineExceeded, TurnCancelled):
+                raise
+            except Exception as e:
+                return ToolMessage(content=f"Error: {e}", tool_call_id=call["id"], name=call["name"], status="error")
+            if isinstance(result.artifact, dict) and result.artifact.get("error"):
+                # Failures reported through tool_error()
+                result.status = "error"
+            return result
+
+        def reply_to(call: Dict[str, Any], result: ToolMessage, note: str = "") -> ToolMessage:
+            """Copy of an earlier result addressed to another call."""
+            return ToolMessage(
+                content=f"{result.content}{note}",
+                artifact=result.artifact,
+                additional_kwargs=result.additional_kwargs,
+                status=result.status,
+                tool_call_id=call["id"],
+                name=call["name"]
+            )
+
+        pending: Dict[str, asyncio.Task] = {}
+        for call in last_message.tool_calls:
+            key = _call_key(call)
+            if key not in previous_results and key not in pending:
+                pending[key] = asyncio.ensure_future(run_tool(call))
+        with profile_stage("tools"):
+            await asyncio.gather(*pending.values())
+
+        results = []
+        for call in last_message.tool_calls:
+            key = _call_key(call)
+            if key in previous_results:
+                loop_metrics["repeated_calls_served"] += 1
+                results.append(reply_to(call, previous_results[key], (
+                    f"\n\n(Repeated call: this is the result of an identical earlier "
+                    f"'{call['name']}' call. Change the arguments or answer with what you have.)"
+                )))
+                continue
+            result = pending[key].result()
+            if result.tool_call_id != call["id"]:
+                # Same call twice in one batch: it ran once, both get the result
+                loop_metrics["duplicate_calls_merged"] += 1
+                result = reply_to(call, result)
+            results.append(result)
+        # Keep only a preview and a blob reference of large outputs in state
+        return {"messages": [offload_tool_message(result) for result in results]}
+
+    return tool_node
+
+def make_finalize_node(llm: Any, system_prompt: str) -> Callable:
+    """Create the node that produces a final answer once the budget is used up."""
+    async def finalize_node(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        last_message = messages[-1]
+        reason = _budget_exceeded(messages) or "tool budget used up"
+        loop_metrics["budget_exhausted"] += 1
+        loop_metrics["skipped_tool_calls"] += len(last_message.tool_calls)
+
+        # Every requested call needs a reply before the model can be asked again
+        skipped = [
+            ToolMessage(content=f"Not run: {reason}.", tool_call_id=call["id"], name=call["name"])
+            for call in last_message.tool_calls
+        ]
+        instruction = SystemMessage(content=(
+            f"Stop calling tools: {reason}. Answer the user's question as well as you can "
+            "with the information gathered so far, and briefly say what could not be looked up."
+        ))
+        prompt = _with_system_prompt(list(messages) + skipped, system_prompt) + [instruction]
+
+        # The plain LLM has no tools bound, so this always ends the turn
+        with profile_stage("finalize"):
+            response = await _invoke_tier("synthesis", llm, prompt, "finalize")
+
+        return {"messages": skipped + [response]}
+
+    return finalize_node
+
+def format_loop_metrics() -> str:
+    """Summary of calls saved or cut short by the budget, or "" if none."""
+    if not loop_metrics:
+        return ""
+    labels = {
+        "repeated_calls_served": "repeated calls served from earlier results",
+        "duplicate_calls_merged": "duplicate calls merged",
+        "budget_exhausted": "turns stopped by the budget or loop detection",
+        "skipped_tool_calls": "tool calls skipped",
+    }
+    return ", ".join(f"{count} {labels.get(name, name)}" for name, count in loop_metrics.items())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Bulk document ingestion into a LaunchpadAI collection.
+
+Walks a directory and ingests every file type the embedding function
+processes (PDF, Markdown, text, Word). For each file it creates the
+collection document in Firestore, then streams the file to Cloud Storage with
+a resumable upload. The upload triggers processDocumentEmbeddings just as an
+upload from the web app does. Uploads run with bounded concurrency.
+
+Progress is kept in a state file. Files whose content hash hasn't changed
+since the last run are skipped, and an interrupted run resumes unfinished
+uploads from the last byte the server acknowledged. Finally every uploaded
+document is polled until its chunks come back from search_collection.
+
+Usage:
+    python python-scripts/launchpad_ingest.py ./docs --user-id <uid> --collection-id <id> --concurrency 8
+
+Needs firebase-admin and Google application default credentials
+(GOOGLE_APPLICATION_CREDENTIALS) for the project; MCP_ENDPOINT_ID and
+MCP_API_KEY must point at an MCP endpoint of the same collection.
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import firebase_admin
+import requests
+from dotenv import load_dotenv
+from firebase_admin import firestore, storage
+
+# Load environment variables from .env.local
+load_dotenv("./.env.local")
+
+FIREBASE_STORAGE_BUCKET = os.getenv("FIREBASE_STORAGE_BUCKET")
+# Extensions processDocumentEmbeddings accepts (functions/src/storage/createEmbeddings.ts)
+SUPPORTED_EXTENSIONS = (".pdf", ".md", ".txt", ".doc", ".docx")
+# Bytes per upload request; resumable uploads need a multiple of 256 KiB
+UPLOAD_CHUNK_BYTES = int(os.getenv("INGEST_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_RETRIES = 3
+UPLOAD_TIMEOUT = 120
+
+class IngestState:
+    """Per-file progress, kept so a rerun can skip or resume work.
+
+    Entries are keyed by the file's path relative to the ingested directory
+    and hold its content hash, document id, storage path, resumable upload
+    session URL and status: uploading, uploaded, searchable or failed.
+
+    Each change is appended to a journal next to the state file, so an
+    update costs one short write however many files there are. The journal
+    is replayed on load and folded into the JSON snapshot by compact().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.files = json.load(f)["files"]
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-write leaves at most a partial last line
+                        break
+                    self.files.setdefault(change["key"], {}).update(change["fields"])
+        self._lock = threading.Lock()
+        self._journal = open(self.journal_path, "a")
+        self.compact()
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.files.get(key, {}))
+
+    def update(self, key: str, **fields: Any):
+        with self._lock:
+            self.files.setdefault(key, {}).update(fields)
+            self._journal.write(json.dumps({"key": key, "fields": fields}) + "\n")
+            self._journal.flush()
+
+    def compact(self):
+        """Write every entry to the state file and empty the journal."""
+        with self._lock:
+            # Write-then-rename, so a crash never leaves a truncated state file
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"version": 1, "files": self.files}, f, indent=2)
+            os.replace(temp_path, self.path)
+            # Replaying changes the snapshot already holds is harmless, so a crash before this loses nothing
+            self._journal.truncate(0)
+
+class CollectionTarget:
+    """The Firestore documents and Cloud Storage objects of one collection."""
+
+    def __init__(self, user_id: str, collection_id: str, bucket: Optional[str], product_id: Optional[str] = None):
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            firebase_admin.initialize_app(options={"storageBucket": bucket} if bucket else None)
+        self.user_id = user_id
+        self.collection_id = collection_id
+        self.db = firestore.client()
+        self.bucket = storage.bucket()
+
+        collection = self.db.document(f"mycollections/{user_id}/mycollections/{collection_id}").get()
+        if not collection.exists:
+            raise ValueError(f"Collection {collection_id} not found for user {user_id}")
+        # The embedding function takes the product from the collection, so default to the same
+        self.product_id = product_id or (collection.to_dict() or {}).get("productId", "")
+
+    def _document(self, document_id: str) -> Any:
+        return self.db.document(f"mydocuments/{self.user_id}/mydocuments/{document_id}")
+
+    def new_document_id(self) -> str:
+        return self.db.collection(f"mydocuments/{self.user_id}/mydocuments").document().id
+
+    def storage_path(self, document_id: str, filename: str) -> str:
+        # Same layout as the web app; the embedding function parses ids out of it
+        return f"storage/{self.user_id}/collections/{self.collection_id}/documents/{document_id}/{filename}"
+
+    def save_document(self, document_id: str, title: str, storage_path: str, chunk_size: int, overlap: int, new: bool):
+        """Create or update the document record. It must exist before the upload triggers indexing."""
+        now = int(time.time())
+        data = {
+            "collectionId": self.collection_id,
+            "productId": self.product_id,
+            "userId": self.user_id,
+            "title": title,
+            "filePath": storage_path,
+            "status": "uploading",
+            "chunkSize": chunk_size,
+            "overlap": overlap,
+            "updatedAt": now,
+        }
+        if new:
+            data.update(description="", url="", tags=[], createdAt=now)
+        self._document(document_id).set(data, merge=True)
+
+    def start_upload(self, storage_path: str, content_type: str, size: int) -> str:
+        """Open a resumable upload session; returns its URL."""
+        return self.bucket.blob(storage_path).create_resumable_upload_session(content_type=content_type, size=size)
+
+    def statuses(self, document_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Indexing status of each document, read in one round trip."""
+        snapshots = self.db.get_all([self._document(document_id) for document_id in document_ids])
+        return {snapshot.id: (snapshot.to_dict() or {}).get("status") for snapshot in snapshots}
+
+def walk_documents(root: str, extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS) -> Iterator[str]:
+    """Paths of the non-empty files under root with a supported extension, in a stable order."""
+    for directory, subdirectories, filenames in os.walk(root):
+        # Skip hidden directories such as .git
+        subdirectories[:] = sorted(d for d in subdirectories if not d.startswith("."))
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            if filename.lower().endswith(extensions) and os.path.getsize(path) > 0:
+                yield path
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _committed_bytes(response: requests.Response) -> int:
+    # A 308 says which bytes the server has as "Range: bytes=0-N"; no header means none yet
+    committed = response.headers.get("Range")
+    return int(committed.rsplit("-", 1)[1]) + 1 if committed else 0
+
+def upload_offset(http: requests.Session, url: str, size: int) -> Optional[int]:
+    """Bytes an upload session has already stored, or None if the session has expired."""
+    response = http.put(url, headers={"Content-Range": f"bytes */{size}"}, timeout=UPLOAD_TIMEOUT)
+    if response.status_code in (200, 201):
+        return size
+    if response.status_code == 308:
+        return _committed_bytes(response)
+    if response.status_code in (404, 410):
+        return None
+    response.raise_for_status()
+    raise requests.HTTPError(f"Unexpected upload status {response.status_code}", response=response)
+
+def upload_file(http: requests.Session, url: str, path: str, offset: int, size: int,
+                chunk_bytes: int = UPLOAD_CHUNK_BYTES) -> int:
+    """Stream path to an upload session from offset, one chunk in memory at a time.
+
+    Failed requests are retried from whatever the server acknowledged.
+    Returns the number of bytes sent.
+    """
+    sent = 0
+    failures = 0
+    with open(path, "rb") as f:
+        while offset < size:
+            f.seek(offset)
+            chunk = f.read(chunk_bytes)
+            try:
+                response = http.put(
+                    url,
+                    data=chunk,
+                    headers={"Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}"},
+                    timeout=UPLOAD_TIMEOUT
+                )
+                if response.status_code >= 500:
+                    response.raise_for_status()
+            except requests.RequestException:
+                failures += 1
+                if failures > UPLOAD_RETRIES:
+                    raise
+                time.sleep(2 ** failures)
+                resumed_at = upload_offset(http, url, size)
+                if resumed_at is None:
+                    raise
+                offset = resumed_at
+                continue
+
+            sent += len(chunk)
+            if response.status_code in (200, 201):
+                return sent
+            if response.status_code != 308:
+                response.raise_for_status()
+                raise requests.HTTPError(f"Unexpected upload status {response.status_code}", response=response)
+            # The server may keep less than it was sent; carry on from what it has
+            offset = _committed_bytes(response)
+    return sent
+
+def ingest_file(target: CollectionTarget, state: IngestState, root: str, path: str,
+                chunk_size: int, overlap: int) -> Tuple[str, int]:
+    """Upload one file unless it is unchanged; returns (outcome, bytes sent)."""
+    key = os.path.relpath(path, root)
+    size = os.path.getsize(path)
+    sha256 = file_sha256(path)
+    entry = state.get(key)
+    if entry.get("sha256") == sha256 and entry.get("status") in ("uploaded", "searchable"):
+        return "unchanged", 0
+
+    with requests.Session() as http:
+        offset: Optional[int] = None
+        if entry.get("sha256") == sha256 and entry.get("upload_url"):
+            # An earlier run was interrupted mid-upload
+            offset = upload_offset(http, entry["upload_url"], size)
+        if offset is None:
+            filename = os.path.basename(path)
+            document_id = entry.get("document_id") or target.new_document_id()
+            storage_path = target.storage_path(document_id, filename)
+            title = os.path.splitext(filename)[0]
+            target.save_document(document_id, title, storage_path, chunk_size, overlap, new="document_id" not in entry)
+            content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            upload_url = target.start_upload(storage_path, content_type, size)
+            state.update(key, sha256=sha256, size=size, document_id=document_id, storage_path=storage_path,
+                         title=title, upload_url=upload_url, status="uploading", error=None)
+            offset, outcome = 0, "uploaded"
+        else:
+            upload_url, outcome = entry["upload_url"], "resumed"
+
+        sent = upload_file(http, upload_url, path, offset, size)
+    state.update(key, status="uploaded", upload_url=None, uploaded_at=time.time())
+    return outcome, sent
+
+def wait_until_searchable(target: CollectionTarget, state: IngestState, keys: List[str],
+                          timeout: float, interval: float) -> Tuple[List[str], List[str]]:
+    """Poll uploaded documents until search_collection returns their chunks.
+
+    Firestore's status is checked first, so only documents the embedding
+    function reports as indexed are searched for, and failed ones stop early.
+    Returns the keys that became searchable and those that failed.
+    """
+    import langgraph_mcp_collections as collections
+
+    pending = {key: state.get(key) for key in keys}
+    searchable: List[str] = []
+    failed: List[str] = []
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        statuses = target.statuses([entry["document_id"] for entry in pending.values()])
+        for key, entry in list(pending.items()):
+            status = statuses.get(entry["document_id"])
+            if status == "error":
+                state.update(key, status="failed", error="indexing failed")
+                failed.append(key)
+                del pending[key]
+            elif status == "indexed":
+                # Chunks are searched by document title, which is the file name without its extension
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    _, artifact = collections.search_collection.func(query=entry["title"], limit=20)
+                if any(result["title"] == entry["title"] for result in artifact.get("results", [])):
+                    state.update(key, status="searchable", searchable_at=time.time())
+                    searchable.append(key)
+                    del pending[key]
+        if pending:
+            time.sleep(interval)
+    return searchable, failed
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload a directory of documents into a LaunchpadAI collection.")
+    parser.add_argument("directory", help="Directory to ingest (searched recursively)")
+    parser.add_argument("--user-id", required=True, help="Owner of the collection")
+    parser.add_argument("--collection-id", required=True, help="Collection to add the documents to")
+    parser.add_argument("--product-id", default=None, help="Product id for new documents (default: the collection's)")
+    parser.add_argument("--bucket", default=FIREBASE_STORAGE_BUCKET, help="Storage bucket (default: FIREBASE_STORAGE_BUCKET)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Uploads in flight at once")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Characters per embedding chunk")
+    parser.add_argument("--overlap", type=int, default=200, help="Characters of overlap between chunks")
+    parser.add_argument("--state", default=None, help="Progress file (default: .launchpad-ingest-<collection>.json)")
+    parser.add_argument("--no-wait", action="store_true", help="Don't wait for the documents to become searchable")
+    parser.add_argument("--wait-timeout", type=float, default=900, help="Seconds to wait for documents to become searchable")
+    parser.add_argument("--poll-interval", type=float, default=10, help="Seconds between indexing checks")
+    args = parser.parse_args()
+
+    # Importing the collections script builds its LLM client, which is never called here
+    os.environ.setdefault("OPENAI_API_KEY", "unused-by-ingest")
+    state = IngestState(args.state or f".launchpad-ingest-{args.collection_id}.json")
+    target = CollectionTarget(args.user_id, args.collection_id, args.bucket, args.product_id)
+    paths = list(walk_documents(args.directory))
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    print(f"Found {len(paths)} documents ({_format_size(total_bytes)}) in {args.directory}")
+
+    started = time.perf_counter()
+    outcomes: Dict[str, str] = {}
+    bytes_sent = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(ingest_file, target, state, args.directory, path, args.chunk_size, args.overlap): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            key = os.path.relpath(futures[future], args.directory)
+            try:
+                outcome, sent = future.result()
+                bytes_sent += sent
+            except Exception as e:
+                outcome = "failed"
+                state.update(key, error=f"{type(e).__name__}: {e}")
+                print(f"\033[31m❌ {key}: {e}\033[0m")
+            else:
+                if outcome != "unchanged":
+                    print(f"\033[32m✅ {key} {outcome}\033[0m")
+            outcomes[key] = outcome
+    upload_seconds = time.perf_counter() - started
+    state.compact()
+
+    uploaded = [key for key, outcome in outcomes.items() if outcome in ("uploaded", "resumed")]
+    counts = {name: sum(1 for outcome in outcomes.values() if outcome == name) for name in ("unchanged", "uploaded", "resumed", "failed")}
+    print(f"\n{counts['uploaded'] + counts['resumed']} uploaded ({counts['resumed']} resumed), "
+          f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+    if uploaded:
+        print(f"Upload: {len(uploaded)} documents, {_format_size(bytes_sent)} in {upload_seconds:.1f}s "
+              f"({len(uploaded) / upload_seconds:.2f} docs/s, {_format_size(bytes_sent / upload_seconds)}/s)")
+
+    # Documents uploaded by an earlier run that never became searchable are waited for as well
+    waiting = [key for key, outcome in outcomes.items() if outcome != "failed" and state.get(key).get("status") == "uploaded"]
+    if args.no_wait or not waiting:
+        sys.exit(1 if counts["failed"] else 0)
+
+    print(f"Waiting for {len(waiting)} documents to become searchable...")
+    searchable, failed = wait_until_searchable(target, state, waiting, args.wait_timeout, args.poll_interval)
+    state.compact()
+    total_seconds = time.perf_counter() - started
+    searchable_bytes = sum(state.get(key)["size"] for key in searchable)
+    print(f"Searchable: {len(searchable)} of {len(waiting)} documents after {total_seconds:.1f}s "
+          f"({len(searchable) / total_seconds:.2f} docs/s, {_format_size(searchable_bytes / total_seconds)}/s end to end); "
+          f"{len(failed)} failed to index, {len(waiting) - len(searchable) - len(failed)} still pending")
+    sys.exit(1 if counts["failed"] or failed or len(searchable) < len(waiting) else 0)
+
+if __name__ == "__main__":
+    main()
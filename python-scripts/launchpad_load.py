@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Open-loop load generator for the LaunchpadAI MCP and A2A endpoints.
+
+Requests are sent on a fixed arrival schedule (constant or Poisson, with
+optional ramps) whether or not earlier requests have finished, using the same
+clients and payloads as the LangGraph scripts. Latency is measured from each
+request's scheduled send time, so time spent queued behind a slow backend is
+counted instead of silently dropped (coordinated omission), and reported from
+HDR-style histograms next to the uncorrected service time.
+
+Usage:
+    python python-scripts/launchpad_load.py --stages 20:60 --mix search=3,a2a-chat=1
+    python python-scripts/launchpad_load.py --standin --stages 0-200:60,200:30 --arrivals poisson
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+
+SAMPLE_QUERIES = [
+    "pricing strategy",
+    "go-to-market plan",
+    "customer onboarding",
+    "product roadmap",
+    "competitor analysis",
+]
+PERCENTILES = [50, 90, 99, 99.9, 99.99, 100]
+
+class LatencyHistogram:
+    """HDR-style histogram of latencies with bounded relative error.
+
+    Values are bucketed in microseconds: linear buckets up to 2**sub_bucket_bits,
+    then each power of two is split into 2**(sub_bucket_bits - 1) buckets, so
+    every recorded value is reported within 1 / 2**(sub_bucket_bits - 1) of its
+    true value regardless of magnitude.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.half = 1 << (sub_bucket_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        return shift * self.half + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < 2 * self.half:
+            return index
+        shift = index // self.half - 1
+        return ((index - shift * self.half + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in milliseconds at or below which percent of the values fall."""
+        if not self.total:
+            return 0.0
+        if percent >= 100:
+            return self.max_us / 1000
+        target = max(1, int(percent / 100 * self.total + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> Dict[str, float]:
+        return {f"p{p:g}": round(self.percentile(p), 3) for p in PERCENTILES}
+
+class OperationStats:
+    """Latencies and outcomes of one kind of request."""
+
+    def __init__(self):
+        # From the scheduled send time: what a user arriving on schedule would see
+        self.response_time = LatencyHistogram()
+        # From the actual send time: what a closed-loop benchmark would report
+        self.service_time = LatencyHistogram()
+        self.errors = 0
+        self.error_samples: List[str] = []
+
+def parse_stages(spec: str) -> List[Tuple[float, float, float]]:
+    """Parse "RATE:SECONDS" or "FROM-TO:SECONDS" stages, comma-separated."""
+    stages = []
+    for part in spec.split(","):
+        rates, _, seconds = part.strip().partition(":")
+        # A leading or doubled "-" is a negative rate, not a ramp separator
+        if rates.startswith("-") or "--" in rates:
+            raise ValueError(f"Stage {part.strip()!r} has a negative rate; rates must be 0 or more")
+        start, _, end = rates.partition("-")
+        duration = float(seconds or 60)
+        if duration <= 0:
+            raise ValueError(f"Stage {part.strip()!r} must last longer than 0 seconds")
+        stages.append((float(start), float(end or start), duration))
+    return stages
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "op=weight,op=weight" into normalized weights."""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        weights[name] = float(weight or 1)
+    unknown = set(weights) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operation(s): {', '.join(sorted(unknown))}. Choose from {', '.join(OPERATIONS)}")
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+def _stage_offset(start_rate: float, end_rate: float, duration: float, count: float) -> float:
+    """Seconds into a stage by which count requests are due, with the rate ramping linearly."""
+    slope = (end_rate - start_rate) / duration
+    if abs(slope) < 1e-12:
+        return count / start_rate
+    # Solve start_rate * t + slope * t^2 / 2 = count for t
+    return (math.sqrt(max(start_rate ** 2 + 2 * slope * count, 0.0)) - start_rate) / slope
+
+def arrival_times(stages: Sequence[Tuple[float, float, float]], poisson: bool, rng: random.Random) -> Iterator[float]:
+    """Scheduled send times in seconds from the start of the run.
+
+    The n-th request of a stage is sent when n requests are due at the
+    stage's (possibly ramping) rate, so RATE:SECONDS sends RATE * SECONDS
+    requests, the first one as the stage starts. Poisson arrivals use
+    exponentially distributed counts between requests instead of 1.
+    """
+    stage_start = 0.0
+    for start_rate, end_rate, duration in stages:
+        # Requests due over the whole stage: the area under its rate
+        total = (start_rate + end_rate) / 2 * duration
+        count = rng.expovariate(1) if poisson else 0.0
+        # The tolerance keeps float rounding from adding a send at the boundary, which belongs to the next stage
+        while count < total - 1e-9:
+            yield stage_start + _stage_offset(start_rate, end_rate, duration, count)
+            count += rng.expovariate(1) if poisson else 1
+        stage_start += duration
+
+def _search_operation() -> Callable[[int], Optional[str]]:
+    """Collections search with the payload search_collection sends."""
+    import langgraph_mcp_collections as collections
+
+    http = requests.Session()
+    headers = {"Content-Type": "application/json", "x-api-key": collections.MCP_API_KEY or ""}
+
+    def search(n: int) -> Optional[str]:
+        payload = collections._search_payload(SAMPLE_QUERIES[n % len(SAMPLE_QUERIES)], 10)
+        response = http.post(collections.MCP_SERVER_URL, json=payload, headers=headers, timeout=60)
+        if response.status_code != 200 or not response.json().get("success"):
+            return f"HTTP {response.status_code}: {response.text[:200]}"
+        return None
+    return search
+
+def _mcp_chat_operation() -> Callable[[int], Optional[str]]:
+    """launchpad_chat's tools/call over the script's persistent MCP session."""
+    import langgraph_mcp_agent as mcp_agent
+
+    mcp_agent.mcp_session.initialize()
+
+    def chat(n: int) -> Optional[str]:
+        response = mcp_agent.mcp_session.call_tool("chat", {"message": SAMPLE_QUERIES[n % len(SAMPLE_QUERIES)]})
+        return mcp_agent._response_error(response)
+    return chat
+
+def _a2a_client():
+    import langgraph_a2a_agent as a2a_agent
+
+    if not a2a_agent.a2a_client.ensure_authenticated():
+        raise RuntimeError("A2A authentication failed")
+    return a2a_agent.a2a_client
+
+def _a2a_chat_operation() -> Callable[[int], Optional[str]]:
+    client = _a2a_client()
+
+    def chat(n: int) -> Optional[str]:
+        result = client.chat(SAMPLE_QUERIES[n % len(SAMPLE_QUERIES)])
+        return None if result["success"] else result["error"]
+    return chat
+
+def _a2a_health_operation() -> Callable[[int], Optional[str]]:
+    client = _a2a_client()
+
+    def health(n: int) -> Optional[str]:
+        result = client.check_health()
+        return None if result["success"] else result["error"]
+    return health
+
+OPERATIONS: Dict[str, Callable[[], Callable[[int], Optional[str]]]] = {
+    "search": _search_operation,
+    "mcp-chat": _mcp_chat_operation,
+    "a2a-chat": _a2a_chat_operation,
+    "a2a-health": _a2a_health_operation,
+}
+
+async def run_load(stages: Sequence[Tuple[float, float, float]], mix: Dict[str, float],
+                   poisson: bool = False, concurrency: int = 256, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Send requests on schedule and collect latency statistics per operation."""
+    rng = random.Random(seed)
+    operations = {name: OPERATIONS[name]() for name in mix}
+    names, weights = list(mix), list(mix.values())
+    stats = {name: OperationStats() for name in mix}
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    loop = asyncio.get_running_loop()
+    max_dispatch_lag = 0.0
+    in_flight = set()
+
+    def send(name: str, n: int, scheduled: float) -> Tuple[float, float, Optional[str]]:
+        started = time.perf_counter()
+        try:
+            error = operations[name](n)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        return finished - scheduled, finished - started, error
+
+    async def dispatch(name: str, n: int, scheduled: float):
+        response_time, service_time, error = await loop.run_in_executor(executor, send, name, n, scheduled)
+        operation = stats[name]
+        operation.response_time.record(response_time)
+        operation.service_time.record(service_time)
+        if error:
+            operation.errors += 1
+            if len(operation.error_samples) < 5:
+                operation.error_samples.append(error)
+
+    started = time.perf_counter()
+    for n, offset in enumerate(arrival_times(stages, poisson, rng)):
+        scheduled = started + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        max_dispatch_lag = max(max_dispatch_lag, time.perf_counter() - scheduled)
+        task = asyncio.ensure_future(dispatch(rng.choices(names, weights)[0], n, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+    executor.shutdown()
+    elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "max_dispatch_lag": max_dispatch_lag, "operations": stats}
+
+def build_report(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-friendly summary of a load run."""
+    total = OperationStats()
+    operations = {}
+    for name, operation in result["operations"].items():
+        total.response_time.merge(operation.response_time)
+        total.service_time.merge(operation.service_time)
+        total.errors += operation.errors
+        operations[name] = operation
+    operations["all"] = total
+
+    report = {
+        "elapsed_s": round(result["elapsed"], 3),
+        "max_dispatch_lag_ms": round(result["max_dispatch_lag"] * 1000, 3),
+        "operations": {},
+    }
+    for name, operation in operations.items():
+        report["operations"][name] = {
+            "requests": operation.response_time.total,
+            "errors": operation.errors,
+            "throughput_rps": round(operation.response_time.total / result["elapsed"], 2) if result["elapsed"] else 0,
+            "response_time_ms": operation.response_time.summary(),
+            "service_time_ms": operation.service_time.summary(),
+            "error_samples": operation.error_samples,
+        }
+    return report
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n\033[1mLoad run: {report['elapsed_s']:.1f}s, max dispatch lag {report['max_dispatch_lag_ms']:.1f} ms\033[0m")
+    header = "".join(f"{f'p{p:g}':>10}" for p in PERCENTILES)
+    print(f"{'operation':<12}{'latency':<10}{'requests':>9}{'errors':>8}{'rps':>8}{header}")
+    for name, operation in report["operations"].items():
+        for label, key in (("response", "response_time_ms"), ("service", "service_time_ms")):
+            values = "".join(f"{value:>10.1f}" for value in operation[key].values())
+            if label == "response":
+                print(f"{name:<12}{label:<10}{operation['requests']:>9}{operation['errors']:>8}{operation['throughput_rps']:>8.1f}{values}")
+            else:
+                print(f"{'':<12}{label:<10}{'':>25}{values}")
+        for sample in operation["error_samples"]:
+            print(f"\033[31m  {sample}\033[0m")
+    print("\033[90mresponse = from scheduled send time (corrected for coordinated omission); service = from actual send time\033[0m")
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the LaunchpadAI endpoints.")
+    parser.add_argument("--stages", default="10:30", help='Arrival rate stages, e.g. "10:30" or "0-100:60,100:120" (requests/s:seconds)')
+    parser.add_argument("--arrivals", choices=["constant", "poisson"], default="constant", help="Arrival process")
+    parser.add_argument("--mix", default="search=1", help=f"Weighted operation mix from {', '.join(OPERATIONS)}, e.g. search=3,a2a-chat=1")
+    parser.add_argument("--concurrency", type=int, default=256, help="Maximum requests in flight; later arrivals queue")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for arrivals and the mix")
+    parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON to FILE")
+    parser.add_argument("--standin", action="store_true", help="Run against a local stand-in server instead of MCP_BASE_URL/A2A_BASE_URL")
+    parser.add_argument("--standin-latency-ms", type=float, default=20.0, help="Median stand-in response time")
+    parser.add_argument("--standin-stall", metavar="EVERY:MS", default=None, help="Stall the stand-in for MS every EVERY seconds")
+    args = parser.parse_args()
+
+    if args.standin:
+        from launchpad_standin import StandinConfig, start_standin_server
+
+        stall_every, _, stall_ms = (args.standin_stall or "0:0").partition(":")
+        config = StandinConfig(args.standin_latency_ms, stall_every=float(stall_every), stall_ms=float(stall_ms or 0), seed=args.seed)
+        _, base_url = start_standin_server(config)
+        # The script modules read their configuration on import, which happens after this
+        os.environ.update(MCP_BASE_URL=base_url, A2A_BASE_URL=base_url)
+        for name in ("MCP_ENDPOINT_ID", "MCP_API_KEY", "MCP_AGENT_ID", "AGENT_MCP_API_KEY", "A2A_AGENT_ID", "A2A_CLIENT_ID", "A2A_CLIENT_SECRET"):
+            os.environ.setdefault(name, "standin")
+        print(f"Stand-in server at {base_url}")
+    # Importing a script builds its LLM client, which is never called here
+    os.environ.setdefault("OPENAI_API_KEY", "unused-by-load-generator")
+
+    try:
+        stages = parse_stages(args.stages)
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Stages: {args.stages} ({args.arrivals} arrivals), mix: {', '.join(f'{n}={w:.0%}' for n, w in mix.items())}")
+
+    # The clients log every request; keep that out of the report
+    report_stream = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        result = asyncio.run(run_load(stages, mix, args.arrivals == "poisson", args.concurrency, args.seed))
+    finally:
+        sys.stdout.close()
+        sys.stdout = report_stream
+
+    report = build_report(result)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
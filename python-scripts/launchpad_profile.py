@@ -0,0 +1,155 @@
+"""Per-turn CPU and allocation profiling for the LaunchpadAI LangGraph scripts.
+
+When profiling is on, every graph turn runs under cProfile, and tracemalloc
+snapshots are taken around the agent, tool and finalize nodes. Each turn
+writes a text report (hot functions and top allocation sites per stage) plus
+the raw .prof file, which snakeviz or pstats can open, to PROFILE_DIR.
+
+Turn it on with --profile, or at runtime with the REPL's "profile" command.
+"""
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, List, Optional, Tuple
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+# Functions and allocation sites listed per report
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "25"))
+# Stack frames tracemalloc keeps per allocation; more frames cost more overhead
+PROFILE_TRACE_FRAMES = int(os.getenv("PROFILE_TRACE_FRAMES", "1"))
+
+class TurnProfile:
+    """What was measured during one turn."""
+
+    def __init__(self, number: int, label: str):
+        self.number = number
+        self.label = label
+        self.started_at = time.perf_counter()
+        self.cpu = cProfile.Profile()
+        self.report_path: Optional[str] = None
+        # Seconds spent taking allocation snapshots, included in the wall time
+        self.overhead = 0.0
+        # (stage, seconds, top allocation differences) per profiled stage
+        self.stages: List[Tuple[str, float, List[tracemalloc.StatisticDiff]]] = []
+
+current_profile: contextvars.ContextVar[Optional[TurnProfile]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+class TurnProfiler:
+    """Switchable profiler shared by a script's turns."""
+
+    def __init__(self, directory: str = PROFILE_DIR, enabled: bool = False):
+        self.directory = directory
+        self.enabled = False
+        self.turns = 0
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACE_FRAMES)
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def toggle(self) -> bool:
+        """Switch profiling on or off; returns the new state."""
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    @contextmanager
+    def turn(self, label: str) -> Iterator[Optional[TurnProfile]]:
+        """Profile one graph turn and write its report afterwards.
+
+        Start the turn's task inside this block: the task copies the context,
+        which is how the nodes find the turn they belong to.
+        """
+        if not self.enabled:
+            yield None
+            return
+        self.turns += 1
+        profile = TurnProfile(self.turns, label)
+        token = current_profile.set(profile)
+        # cProfile sees the event loop thread only; sync tools running in worker threads show up as waits
+        profile.cpu.enable()
+        try:
+            yield profile
+        finally:
+            profile.cpu.disable()
+            current_profile.reset(token)
+            profile.report_path = self.write_report(profile)
+
+    def write_report(self, profile: TurnProfile) -> str:
+        """Write the turn's report and .prof file; returns the report path."""
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^a-z0-9]+", "-", profile.label.lower())[:40].strip("-") or "turn"
+        base = os.path.join(self.directory, f"turn-{os.getpid()}-{profile.number:04d}-{slug}")
+        profile.cpu.dump_stats(f"{base}.prof")
+
+        stats_text = io.StringIO()
+        stats = pstats.Stats(profile.cpu, stream=stats_text)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+        lines = [
+            f"Turn {profile.number}: {profile.label!r}",
+            f"Wall time: {time.perf_counter() - profile.started_at:.3f}s "
+            f"(of which {profile.overhead:.3f}s taking allocation snapshots)",
+            "",
+            "== Hot functions (cumulative time) ==",
+            stats_text.getvalue().strip(),
+        ]
+        for stage, seconds, diffs in profile.stages:
+            lines += ["", f"== Allocations during {stage} ({seconds:.3f}s) =="]
+            lines += [str(diff) for diff in diffs] or ["(no allocations recorded)"]
+        with open(f"{base}.txt", "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return f"{base}.txt"
+
+def profile_stage(name: str) -> Any:
+    """Record allocations made during a stage of a profiled turn; a no-op otherwise.
+
+    Stages that overlap (e.g. parallel tool calls) each see the others' allocations.
+    """
+    profile = current_profile.get()
+    if profile is None or not tracemalloc.is_tracing():
+        return nullcontext()
+    return _stage(profile, name)
+
+# Allocations by tracemalloc itself and the import machinery aren't the turn's
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+@contextmanager
+def _stage(profile: TurnProfile, name: str) -> Iterator[None]:
+    # Snapshots are expensive; keep them out of the CPU profile and report their cost separately
+    overhead_started = time.perf_counter()
+    profile.cpu.disable()
+    before = tracemalloc.take_snapshot()
+    profile.cpu.enable()
+    profile.overhead += time.perf_counter() - overhead_started
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        overhead_started = time.perf_counter()
+        profile.cpu.disable()
+        diffs = [
+            diff for diff in tracemalloc.take_snapshot().compare_to(before, "lineno")
+            if diff.size_diff > 0 and diff.traceback[0].filename not in _IGNORED_FILES
+        ][:PROFILE_TOP]
+        profile.cpu.enable()
+        profile.overhead += time.perf_counter() - overhead_started
+        profile.stages.append((name, elapsed, diffs))
+
+# Shared by the script's REPL and the graph nodes
+profiler = TurnProfiler(enabled=os.getenv("PROFILE", "").lower() in ("1", "true", "yes"))
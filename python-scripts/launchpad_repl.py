@@ -0,0 +1,121 @@
+"""Non-blocking interactive prompt for the LaunchpadAI LangGraph scripts.
+
+input() blocks the thread it runs on, so calling it from the event loop
+stops everything else (token refreshes, health probes, warm-up) while the
+user types. AsyncLineReader runs input() on a reader thread instead and hands
+lines back to the loop, and BackgroundTasks keeps track of the work that runs
+in the meantime.
+"""
+import asyncio
+import queue
+import signal
+import threading
+from typing import Any, Coroutine, List, Optional, Set, Tuple
+
+def _resolve(future: asyncio.Future, line: Optional[str], error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+class AsyncLineReader:
+    """Reads lines from stdin without blocking the event loop.
+
+    Lines are read with input() on a daemon thread, so readline history and
+    editing keep working. Ctrl+C at the prompt raises KeyboardInterrupt from
+    readline(); the reader thread can't be interrupted, so the read carries on
+    and its line is returned by the next readline() call.
+    """
+
+    def __init__(self):
+        self._requests: "queue.Queue[Tuple[str, asyncio.AbstractEventLoop, asyncio.Future]]" = queue.Queue()
+        self._pending: Optional[asyncio.Future] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _read_lines(self):
+        while True:
+            prompt, loop, future = self._requests.get()
+            try:
+                line, error = input(prompt), None
+            except Exception as e:
+                line, error = None, e
+            try:
+                loop.call_soon_threadsafe(_resolve, future, line, error)
+            except RuntimeError:
+                # The loop closed while we were waiting for the user
+                return
+            if isinstance(error, EOFError):
+                return
+
+    async def readline(self, prompt: str = "") -> str:
+        """Wait for the next line without blocking other tasks.
+
+        Raises EOFError at end of input and KeyboardInterrupt on Ctrl+C.
+        """
+        loop = asyncio.get_running_loop()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._read_lines, name="repl-reader", daemon=True)
+            self._thread.start()
+        if self._pending is None:
+            self._pending = loop.create_future()
+            self._requests.put((prompt, loop, self._pending))
+        else:
+            # An interrupted read is still waiting for its line; show the prompt again
+            print(prompt, end="", flush=True)
+
+        interrupted = loop.create_future()
+        previous_handler = signal.getsignal(signal.SIGINT)
+        try:
+            loop.add_signal_handler(signal.SIGINT, lambda: interrupted.done() or interrupted.set_result(None))
+            handler_installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows event loops and non-main threads can't install signal handlers
+            handler_installed = False
+
+        try:
+            await asyncio.wait({self._pending, interrupted}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if handler_installed:
+                loop.remove_signal_handler(signal.SIGINT)
+                signal.signal(signal.SIGINT, previous_handler)
+
+        if not self._pending.done():
+            raise KeyboardInterrupt
+        future, self._pending = self._pending, None
+        return future.result()
+
+class BackgroundTasks:
+    """Work that runs while the REPL waits for input: warm-ups, refreshes, prefetches.
+
+    Failures are reported rather than lost, and stop() cancels whatever is
+    still running when the session ends.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+        """Run coro in the background on the running event loop."""
+        task = asyncio.create_task(coro, name=name)
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+        return task
+
+    def _finished(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"\n\033[33mBackground task {task.get_name()} failed: {task.exception()}\033[0m")
+
+    def running(self) -> List[str]:
+        """Names of the tasks still running."""
+        return sorted(task.get_name() for task in self._tasks)
+
+    async def stop(self):
+        """Cancel the remaining tasks and wait for them to finish."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
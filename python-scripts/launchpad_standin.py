@@ -0,0 +1,164 @@
+"""Local stand-in for the LaunchpadAI endpoints the scripts talk to.
+
+Answers the collections MCP search, the MCP agent JSON-RPC endpoint and the
+A2A token, chat, health and capabilities endpoints with canned responses after
+a configurable delay, so load runs and experiments work without a deployment.
+A periodic stall can be switched on to see how the scripts and the load
+generator behave when the backend hangs.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+class StandinConfig:
+    """Delay applied to every stand-in response."""
+
+    def __init__(self, latency_ms: float = 20.0, jitter: float = 0.5,
+                 stall_every: float = 0.0, stall_ms: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        # Latency is drawn from a lognormal distribution with this sigma
+        self.jitter = jitter
+        # Every stall_every seconds the server hangs for stall_ms (0 disables)
+        self.stall_every = stall_every
+        self.stall_ms = stall_ms
+        self.started_at = time.monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait before answering a request received now."""
+        with self._lock:
+            delay = self.latency_ms * self._random.lognormvariate(0, self.jitter) / 1000 if self.latency_ms else 0.0
+        if self.stall_every and self.stall_ms:
+            # Requests arriving during a stall wait until it is over
+            into_cycle = (time.monotonic() - self.started_at) % self.stall_every
+            if into_cycle < self.stall_ms / 1000:
+                delay += self.stall_ms / 1000 - into_cycle
+        return delay
+
+def _search_results(query: str, limit: int, snippet_length: int) -> Dict[str, Any]:
+    content = f"Stand-in chunk about {query}. " * 40
+    results = [
+        {
+            "id": f"chunk-{i}",
+            "document_title": f"Stand-in document {i}",
+            "filename": f"document-{i}.pdf",
+            "chunk_content": content[:snippet_length],
+            "content_truncated": len(content) > snippet_length,
+            "relevance_score": round(1 - i * 0.05, 3),
+        }
+        for i in range(min(limit, 10))
+    ]
+    return {"success": True, "results": results, "total": len(results)}
+
+def _mcp_agent_response(request: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+    method = request.get("method", "")
+    if method.startswith("notifications/"):
+        return 202, None
+    if method == "initialize":
+        result = {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "launchpad-standin", "version": "1.0.0"},
+        }
+    elif method == "tools/list":
+        result = {"tools": [
+            {"name": "chat", "description": "Chat with the agent", "inputSchema": {"type": "object"}},
+            {"name": "get_agent_info", "description": "Agent information", "inputSchema": {"type": "object"}},
+        ]}
+    elif method == "tools/call":
+        params = request.get("params", {})
+        if params.get("name") == "get_agent_info":
+            info = {"id": "standin", "name": "Stand-in Agent", "capabilities": ["chat"]}
+            result = {"content": [{"type": "text", "text": json.dumps(info)}]}
+        else:
+            # Long answers arrive as several text parts, like the real agent's
+            message = params.get("arguments", {}).get("message", "")
+            result = {"content": [
+                {"type": "text", "text": f"Stand-in answer to: {message}"},
+                {"type": "text", "text": "Key points:\n- Start with a narrow audience\n- Price on value, not cost"},
+                {"type": "text", "text": "Sources: [Launch guide](https://example.com/launch) and [Pricing notes](https://example.com/pricing)"},
+            ]}
+    else:
+        return 200, {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": f"Method not found: {method}"}}
+    return 200, {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+class _Handler(BaseHTTPRequestHandler):
+    config: StandinConfig
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def _reply(self, status: int, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None):
+        time.sleep(self.config.delay())
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        match = re.fullmatch(r"/api/a2a/agents/([^/]+)/(health|capabilities)", self.path)
+        if not match:
+            return self._reply(404, {"error": "Not found"})
+        agent_id, endpoint = match.groups()
+        if endpoint == "health":
+            return self._reply(200, {
+                "status": "healthy",
+                "agent_id": agent_id,
+                "checks": {"agent_enabled": {"status": "pass"}, "api_key_configured": {"status": "pass"}},
+            })
+        return self._reply(200, {
+            "agent_id": agent_id,
+            "agent_name": "Stand-in Agent",
+            "capabilities": [{"name": "chat", "description": "Chat with the agent"}],
+        })
+
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == "/api/a2a/auth/token":
+            return self._reply(200, {"access_token": "standin-token", "token_type": "Bearer", "expires_in": 3600})
+        match = re.fullmatch(r"/api/a2a/agents/([^/]+)/chat", self.path)
+        if match:
+            return self._reply(200, {
+                "response": f"Stand-in answer to: {body.get('message', '')}",
+                "metadata": {"agent_name": "Stand-in Agent", "conversation_id": "standin-conversation"},
+            })
+        if re.fullmatch(r"/api/mcp/agents/[^/]+", self.path):
+            status, response = _mcp_agent_response(body)
+            headers = {"Mcp-Session-Id": "standin-session"} if body.get("method") == "initialize" else None
+            return self._reply(status, response, headers)
+        if re.fullmatch(r"/api/mcp/[^/]+", self.path):
+            if body.get("chunk_id"):
+                return self._reply(200, {"success": True, "chunk": {
+                    "id": body["chunk_id"], "document_title": "Stand-in document", "chunk_content": "Full stand-in chunk.",
+                }})
+            return self._reply(200, _search_results(
+                body.get("query", ""), int(body.get("limit", 10)), int(body.get("snippet_length", 300))
+            ))
+        return self._reply(404, {"error": "Not found"})
+
+    def do_DELETE(self):
+        self._reply(200, {})
+
+def start_standin_server(config: Optional[StandinConfig] = None, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in on a background thread; returns the server and its base URL."""
+    handler = type("StandinHandler", (_Handler,), {"config": config or StandinConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -489,6 +489,93 @@ async function searchDocumentsForMcp(
   }
 }
 
+// Fetch a single chunk with its full content, scoped to the endpoint's collection
+async function getDocumentChunkForMcp(chunkId: string, collectionId: string) {
+  const neonDbConnectionString = process.env.NEON_DB_CONNECTION_STRING;
+  if (!neonDbConnectionString) {
+    console.error("[DEBUG] Missing NeonDB connection string");
+    return {
+      success: false,
+      error: "Database connection string not configured",
+    };
+  }
+
+  let client: Client | null = null;
+
+  try {
+    client = new Client({
+      connectionString: neonDbConnectionString,
+    });
+    await client.connect();
+
+    const chunkQuery = `
+      SELECT
+        c.id,
+        c.document_id,
+        c.collection_id,
+        c.chunk_index,
+        c.total_chunks,
+        c.chunk_content,
+        c.filename,
+        c.file_url,
+        c.document_title,
+        c.collection_name
+      FROM document_chunks c
+      WHERE c.id = $1 AND c.collection_id = $2
+    `;
+
+    const chunkResult = await client.query(chunkQuery, [
+      chunkId,
+      collectionId,
+    ]);
+    if (chunkResult.rows.length === 0) {
+      return { success: false, error: "Chunk not found" };
+    }
+
+    return { success: true, chunk: chunkResult.rows[0] };
+  } catch (error) {
+    console.error("[DEBUG] Error fetching document chunk:", error);
+    return {
+      success: false,
+      error:
+        error instanceof Error ? error.message : "An unknown error occurred",
+    };
+  } finally {
+    if (client) {
+      await client.end();
+    }
+  }
+}
+
+// Keep only the requested fields and cut chunk content down to a snippet so
+// clients that only render a preview don't download every chunk in full
+function projectSearchResults(
+  results: Record<string, any>[],
+  fields?: string[],
+  snippetLength?: number
+) {
+  return results.map((row) => {
+    const projected: Record<string, any> = fields
+      ? Object.fromEntries(
+          fields
+            .filter((field) => field in row)
+            .map((field) => [field, row[field]])
+        )
+      : { ...row };
+
+    if (
+      snippetLength !== undefined &&
+      typeof projected.chunk_content === "string" &&
+      projected.chunk_content.length > snippetLength
+    ) {
+      projected.chunk_content = projected.chunk_content.slice(0, snippetLength);
+      projected.content_truncated = true;
+    }
+
+    return projected;
+  });
+}
+
 export async function POST(
   req: NextRequest,
   context: { params: Promise<{ endpointId: string }> }
@@ -555,7 +642,30 @@ export async function POST(
     }
 
     // Validate request parameters
-    const { query, limit = 10 } = requestBody;
+    const { query, limit = 10, fields, snippet_length, chunk_id } = requestBody;
+
+    // Fetch a single chunk in full when the client asks for it by id
+    if (chunk_id !== undefined) {
+      if (typeof chunk_id !== "string" && typeof chunk_id !== "number") {
+        console.error(`[MCP] Invalid chunk_id parameter: ${chunk_id}`);
+        return NextResponse.json(
+          { error: "Invalid chunk_id parameter" },
+          { status: 400 }
+        );
+      }
+
+      const chunkResult = await getDocumentChunkForMcp(
+        String(chunk_id),
+        config.collectionId
+      );
+
+      if (!chunkResult.success) {
+        const status = chunkResult.error === "Chunk not found" ? 404 : 500;
+        return NextResponse.json({ error: chunkResult.error }, { status });
+      }
+
+      return NextResponse.json(chunkResult);
+    }
 
     if (!query || typeof query !== "string") {
       console.error(`[MCP] Missing or invalid query parameter`);
@@ -575,6 +685,33 @@ export async function POST(
       );
     }
 
+    if (
+      fields !== undefined &&
+      (!Array.isArray(fields) ||
+        !fields.every((field: unknown) => typeof field === "string"))
+    ) {
+      console.error(`[MCP] Invalid fields parameter: ${fields}`);
+      return NextResponse.json(
+        { error: "Invalid fields parameter (must be an array of strings)" },
+        { status: 400 }
+      );
+    }
+
+    if (
+      snippet_length !== undefined &&
+      (typeof snippet_length !== "number" || snippet_length < 1)
+    ) {
+      console.error(
+        `[MCP] Invalid snippet_length parameter: ${snippet_length}`
+      );
+      return NextResponse.json(
+        {
+          error: "Invalid snippet_length parameter (must be a positive number)",
+        },
+        { status: 400 }
+      );
+    }
+
     console.log(`[MCP] Searching for: "${query}" with limit: ${limit}`);
 
     // Use our custom search function that doesn't require authentication
@@ -597,7 +734,14 @@ export async function POST(
     console.log(
       `[MCP] Search returned ${searchResults.results?.length || 0} results`
     );
-    return NextResponse.json(searchResults);
+    return NextResponse.json({
+      ...searchResults,
+      results: projectSearchResults(
+        searchResults.results || [],
+        fields,
+        snippet_length
+      ),
+    });
   } catch (error) {
     console.error("[MCP] Error processing request:", error);
     return NextResponse.json(
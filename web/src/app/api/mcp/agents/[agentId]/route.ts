@@ -1,3 +1,4 @@
+import { randomUUID } from "crypto";
 import { NextRequest, NextResponse } from "next/server";
 import { streamText } from "ai";
 import { openai } from "@ai-sdk/openai";
@@ -84,9 +85,17 @@ export async function POST(
 
     console.log(`[MCP Agent] Method: ${mcpRequest.method}`);
 
+    // Notifications (e.g. notifications/initialized) carry no id and expect no
+    // JSON-RPC response under the Streamable HTTP transport
+    if (mcpRequest.method?.startsWith("notifications/")) {
+      return new Response(null, { status: 202 });
+    }
+
     // Handle different MCP methods
     switch (mcpRequest.method) {
       case "initialize":
+        // Issue a session id so clients can keep one session across requests.
+        // The server holds no per-session state, so any id is accepted later.
         return NextResponse.json(
           createMcpResponse(mcpRequest.id, {
             protocolVersion: "2024-11-05",
@@ -98,7 +107,8 @@ export async function POST(
               name: agent.name,
               version: "1.0.0",
             },
-          })
+          }),
+          { headers: { "Mcp-Session-Id": randomUUID() } }
         );
 
       case "tools/list":
@@ -306,6 +316,12 @@ export async function POST(
   }
 }
 
+// Session termination from MCP clients. Sessions are stateless on this
+// server, so there is nothing to clean up.
+export async function DELETE() {
+  return new Response(null, { status: 200 });
+}
+
 // Helper functions
 function createMcpResponse(id: string | number, result: any): McpResponse {
   return {